@@ -0,0 +1,56 @@
+"""Add monitor probe method, body limit and body assertions
+
+Revision ID: 3f9c2a7d1b04
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d1b04'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# The schema is otherwise created by create_all on startup, which adds missing
+# tables but never alters existing ones; only touch what is actually missing
+NEW_COLUMNS = [
+    sa.Column('method', sa.String(length=4), nullable=True, server_default='GET'),
+    sa.Column('max_body_bytes', sa.Integer(), nullable=True),
+    sa.Column('body_keyword', sa.String(), nullable=True),
+    sa.Column('body_regex', sa.String(), nullable=True),
+]
+
+
+def _monitor_columns():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('monitor'):
+        return None
+    return {column['name'] for column in inspector.get_columns('monitor')}
+
+
+def upgrade() -> None:
+    existing = _monitor_columns()
+    if existing is None:
+        return
+
+    for column in NEW_COLUMNS:
+        if column.name not in existing:
+            op.add_column('monitor', column)
+    if 'method' not in existing:
+        # The default only backfills existing rows; new rows get it from the model
+        op.alter_column('monitor', 'method', server_default=None)
+
+
+def downgrade() -> None:
+    existing = _monitor_columns()
+    if existing is None:
+        return
+
+    for column in reversed(NEW_COLUMNS):
+        if column.name in existing:
+            op.drop_column('monitor', column.name)
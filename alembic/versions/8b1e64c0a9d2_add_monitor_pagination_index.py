@@ -0,0 +1,36 @@
+"""Add monitor keyset pagination index
+
+Revision ID: 8b1e64c0a9d2
+Revises: 3f9c2a7d1b04
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e64c0a9d2'
+down_revision = '3f9c2a7d1b04'
+branch_labels = None
+depends_on = None
+
+
+def _monitor_indexes():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('monitor'):
+        return None
+    return {index['name'] for index in inspector.get_indexes('monitor')}
+
+
+def upgrade() -> None:
+    existing = _monitor_indexes()
+    if existing is not None and 'ix_monitor_user_created_id' not in existing:
+        op.create_index('ix_monitor_user_created_id', 'monitor', ['user_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    existing = _monitor_indexes()
+    if existing is not None and 'ix_monitor_user_created_id' in existing:
+        op.drop_index('ix_monitor_user_created_id', table_name='monitor')
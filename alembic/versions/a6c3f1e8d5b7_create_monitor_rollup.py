@@ -0,0 +1,45 @@
+"""Create the monitor_rollup table
+
+Revision ID: a6c3f1e8d5b7
+Revises: 4e7b9d2c6a31
+Create Date: 2026-10-17 11:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c3f1e8d5b7'
+down_revision = '4e7b9d2c6a31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('monitor') or inspector.has_table('monitor_rollup'):
+        return
+
+    op.create_table(
+        'monitor_rollup',
+        sa.Column('monitor_id', sa.UUID(), nullable=False),
+        sa.Column('resolution', sa.String(length=2), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('check_count', sa.Integer(), nullable=False),
+        sa.Column('up_count', sa.Integer(), nullable=False),
+        sa.Column('latency_count', sa.Integer(), nullable=False),
+        sa.Column('latency_sum', sa.BigInteger(), nullable=False),
+        sa.Column('latency_min', sa.Integer(), nullable=True),
+        sa.Column('latency_max', sa.Integer(), nullable=True),
+        sa.Column('latency_sketch', sa.LargeBinary(), nullable=True),
+        sa.ForeignKeyConstraint(['monitor_id'], ['monitor.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('monitor_id', 'resolution', 'bucket_start'),
+    )
+    op.create_index('ix_monitor_rollup_resolution_bucket', 'monitor_rollup', ['resolution', 'bucket_start'])
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('monitor_rollup'):
+        op.drop_table('monitor_rollup')
@@ -0,0 +1,47 @@
+"""Add per-phase probe timings to monitor_check
+
+Revision ID: b8e2a4d7c9f0
+Revises: a6c3f1e8d5b7
+Create Date: 2026-10-17 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2a4d7c9f0'
+down_revision = 'a6c3f1e8d5b7'
+branch_labels = None
+depends_on = None
+
+PHASE_COLUMNS = ['dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'transfer_ms']
+
+
+def _check_columns():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('monitor_check'):
+        return None
+    return {column['name'] for column in inspector.get_columns('monitor_check')}
+
+
+def upgrade() -> None:
+    existing = _check_columns()
+    if existing is None:
+        return
+
+    # Columns added to the partitioned parent propagate to every partition
+    for name in PHASE_COLUMNS:
+        if name not in existing:
+            op.add_column('monitor_check', sa.Column(name, sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    existing = _check_columns()
+    if existing is None:
+        return
+
+    for name in reversed(PHASE_COLUMNS):
+        if name in existing:
+            op.drop_column('monitor_check', name)
@@ -0,0 +1,36 @@
+"""Drop monitor.last_alert_sent_at, replaced by the Redis alert debounce key
+
+Revision ID: c42d7e5a18f6
+Revises: 8b1e64c0a9d2
+Create Date: 2026-10-17 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'c42d7e5a18f6'
+down_revision = '8b1e64c0a9d2'
+branch_labels = None
+depends_on = None
+
+
+def _monitor_columns():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('monitor'):
+        return None
+    return {column['name'] for column in inspector.get_columns('monitor')}
+
+
+def upgrade() -> None:
+    existing = _monitor_columns()
+    if existing is not None and 'last_alert_sent_at' in existing:
+        op.drop_column('monitor', 'last_alert_sent_at')
+
+
+def downgrade() -> None:
+    existing = _monitor_columns()
+    if existing is not None and 'last_alert_sent_at' not in existing:
+        op.add_column('monitor', sa.Column('last_alert_sent_at', sa.DateTime(), nullable=True))
@@ -0,0 +1,51 @@
+"""Create the alert_outbox table
+
+Revision ID: d1f5c7a3e2b9
+Revises: b8e2a4d7c9f0
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1f5c7a3e2b9'
+down_revision = 'b8e2a4d7c9f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('monitor') or inspector.has_table('alert_outbox'):
+        return
+
+    op.create_table(
+        'alert_outbox',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('monitor_id', sa.UUID(), nullable=False),
+        sa.Column('kind', sa.String(length=8), nullable=False),
+        sa.Column('recipient', sa.String(), nullable=False),
+        sa.Column('subject', sa.String(), nullable=False),
+        sa.Column('html_body', sa.String(), nullable=False),
+        sa.Column('text_body', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('failed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['monitor_id'], ['monitor.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_alert_outbox_pending', 'alert_outbox', ['next_attempt_at', 'id'],
+        postgresql_where=sa.text('sent_at IS NULL AND failed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('alert_outbox'):
+        op.drop_table('alert_outbox')
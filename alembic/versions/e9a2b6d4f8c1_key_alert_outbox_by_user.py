@@ -0,0 +1,55 @@
+"""Key alert_outbox rows by user so one row can carry a digest
+
+Revision ID: e9a2b6d4f8c1
+Revises: d1f5c7a3e2b9
+Create Date: 2026-10-17 11:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9a2b6d4f8c1'
+down_revision = 'd1f5c7a3e2b9'
+branch_labels = None
+depends_on = None
+
+
+def _outbox_columns():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alert_outbox'):
+        return None
+    return {column['name'] for column in inspector.get_columns('alert_outbox')}
+
+
+def upgrade() -> None:
+    existing = _outbox_columns()
+    if existing is None or 'user_id' in existing:
+        return
+
+    op.add_column('alert_outbox', sa.Column('user_id', sa.UUID(), nullable=True))
+    op.execute(
+        'UPDATE alert_outbox SET user_id = monitor.user_id FROM monitor WHERE monitor.id = alert_outbox.monitor_id'
+    )
+    op.alter_column('alert_outbox', 'user_id', nullable=False)
+    op.create_foreign_key(
+        'alert_outbox_user_id_fkey', 'alert_outbox', 'user', ['user_id'], ['id'], ondelete='CASCADE'
+    )
+    # Drops the monitor foreign key with it
+    op.drop_column('alert_outbox', 'monitor_id')
+
+
+def downgrade() -> None:
+    existing = _outbox_columns()
+    if existing is None or 'monitor_id' in existing:
+        return
+
+    # Digests span monitors and can't be mapped back to one, so the outbox is emptied
+    op.execute('DELETE FROM alert_outbox')
+    op.add_column('alert_outbox', sa.Column('monitor_id', sa.UUID(), nullable=False))
+    op.create_foreign_key(
+        'alert_outbox_monitor_id_fkey', 'alert_outbox', 'monitor', ['monitor_id'], ['id'], ondelete='CASCADE'
+    )
+    op.drop_column('alert_outbox', 'user_id')
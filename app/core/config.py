@@ -27,15 +27,79 @@ class Settings(BaseSettings):
     POSTMARK_API_TOKEN: Optional[str] = os.environ.get("POSTMARK_API_TOKEN")
     EMAIL_FROM: str = "montakhabikasra@gmail.com"
     EMAIL_DEV_MODE: bool = True
+    ALERT_DIGEST_WINDOW_SECONDS: float = 30.0  # transitions per user within this window share one email
+    ALERT_DIGEST_MAX_ITEMS: int = 100  # monitors listed in a digest before "and N more"
+    ALERT_RECOVERY_TTL_SECONDS: int = 7 * 86400  # how long an alerted outage waits for its recovery notice
+    ALERT_OUTBOX_MAX_BATCH: int = 500  # alerts per outbox INSERT
+    ALERT_OUTBOX_FLUSH_INTERVAL: float = 1.0  # seconds between outbox writes
+    ALERT_DELIVERY_INTERVAL: float = 5.0  # seconds between outbox polls when not woken
+    ALERT_DELIVERY_BATCH_SIZE: int = 500  # messages per Postmark batch call (Postmark's maximum)
+    ALERT_MAX_ATTEMPTS: int = 8  # delivery attempts before an alert is marked failed
+    ALERT_RETRY_BASE_SECONDS: float = 30.0  # first retry delay, doubled per attempt
+    ALERT_RETRY_MAX_SECONDS: float = 3600.0  # ceiling on the retry delay
 
     # App
     APP_NAME: str = "PulseCheck"
     DEBUG: bool = False
     CORS_ORIGINS: list = ["*"]
+    BULK_MAX_ITEMS: int = 5000  # items accepted per bulk monitor request
 
     # Worker
-    MONITOR_CHECK_INTERVAL: int = 30  # seconds
+    EMBEDDED_WORKER: bool = True  # run the monitor worker inside API processes
+    WORKER_USE_UVLOOP: bool = True  # standalone worker only
+    WORKER_PROCESSES: int = 1  # standalone worker processes under one supervisor; 0 = one per CPU core
+    WORKER_STATS_INTERVAL: float = 5.0  # seconds between child stats reports to the supervisor
+    WORKER_RESTART_MAX_DELAY: float = 60.0  # ceiling on the restart backoff for a crashing child
+    WORKER_STOP_TIMEOUT: float = 30.0  # seconds a child gets to shut down before it is killed
+    WORKER_HEALTH_HOST: str = "0.0.0.0"
+    WORKER_HEALTH_PORT: int = 8001  # standalone worker /health and /ready
+    MONITOR_CHECK_INTERVAL: int = 30  # seconds between cheap registry/database consistency checks
     EMAIL_DEBOUNCE_MINUTES: int = 60
+    PROBE_MAX_CONCURRENCY: int = 100  # probes running at once per worker
+    PROBE_PER_HOST_LIMIT: int = 6  # probes running at once against one host
+    PROBE_QUEUE_SIZE: int = 1000  # due probes waiting for a slot before dispatch blocks
+    PROBE_TIMEOUT: float = 30.0  # seconds per probe request; ceiling for adaptive timeouts
+    PROBE_CONNECT_TIMEOUT: float = 10.0
+    PROBE_TIMEOUT_FLOOR: float = 2.0  # lowest adaptive read timeout, seconds
+    PROBE_CONNECT_TIMEOUT_FLOOR: float = 1.0  # lowest adaptive connect timeout, seconds
+    PROBE_TIMEOUT_P99_MULTIPLIER: float = 4.0  # adaptive timeout = recent p99 latency x this, clamped
+    PROBE_ADAPTIVE_MIN_SAMPLES: int = 20  # recent samples needed before timeouts adapt
+    PROBE_CONFIRM_RETRIES: int = 2  # quick re-checks that must also fail before a monitor goes DOWN; 0 disables
+    PROBE_CONFIRM_DELAY: float = 2.0  # first re-check delay, doubled per retry with jitter
+    PROBE_MAX_CONNECTIONS: int = 200  # shared probe client pool size per process
+    PROBE_MAX_KEEPALIVE_CONNECTIONS: int = 100  # idle connections kept open for reuse
+    PROBE_KEEPALIVE_EXPIRY: float = 120.0  # seconds an idle connection is kept
+    PROBE_HTTP2: bool = False  # requires the h2 package
+    DNS_CACHE_ENABLED: bool = True  # resolve probe hostnames through the TTL-respecting cache
+    DNS_CACHE_MIN_TTL: float = 5.0  # floor on cached record lifetimes, seconds
+    DNS_CACHE_MAX_TTL: float = 300.0  # ceiling on cached record lifetimes, seconds
+    DNS_CACHE_FALLBACK_TTL: float = 60.0  # lifetime of addresses from getaddrinfo, which has no TTL
+    PROBE_KEEPALIVE_DRAIN_BYTES: int = 64 * 1024  # unasserted bodies up to this size are read so the connection is reused
+    PROBE_MAX_BODY_BYTES: int = 1024 * 1024  # default cap on body bytes read for content assertions
+    PROBE_REGEX_WINDOW_BYTES: int = 4096  # trailing bytes kept between chunks so regex matches can span them
+    STATUS_FLUSH_MAX_BATCH: int = 500  # status updates per batched UPDATE
+    STATUS_FLUSH_INTERVAL: float = 1.0  # seconds between status flushes
+    CHECK_HISTORY_FLUSH_MAX_BATCH: int = 2000  # probe results per COPY into monitor_check
+    CHECK_HISTORY_FLUSH_INTERVAL: float = 2.0  # seconds between check history flushes
+    CHECK_HISTORY_RETENTION_DAYS: int = 30  # daily monitor_check partitions kept
+    ROLLUP_FLUSH_MAX_BATCH: int = 1500  # rollup buckets per merge
+    ROLLUP_FLUSH_INTERVAL: float = 5.0  # seconds between rollup merges
+    LATENCY_WINDOW_SECONDS: int = 300  # live latency percentiles cover the last one to two windows
+    LATENCY_SKETCH_FLUSH_INTERVAL: float = 10.0  # seconds between latency sketch writes to Redis
+    CLUSTER_HEARTBEAT_INTERVAL: float = 5.0  # seconds between worker heartbeats
+    CLUSTER_MEMBER_TTL: float = 15.0  # seconds without a heartbeat before a worker's monitors move
+
+    # WebSocket
+    STATUS_STREAM_MAXLEN: int = 500  # approximate status events kept per monitor for resuming clients
+    STATUS_STREAM_TTL_SECONDS: int = 86400  # streams of monitors that stop publishing expire after this
+    STATUS_STREAM_RESUME_LIMIT: int = 200  # longer gaps are answered with a fresh snapshot instead
+    STATUS_CACHE_TTL_SECONDS: int = 86400  # cached monitor hashes expire after this
+    USER_MONITORS_CACHE_TTL_SECONDS: int = 300  # cached per-user monitor id sets expire after this
+    WS_SEND_QUEUE_SIZE: int = 256  # outbound messages buffered per connection; coalesced updates wait outside it
+    WS_SEND_TIMEOUT: float = 10.0  # seconds a single send may take before the client is dropped
+    WS_SLOW_CONSUMER_POLICY: str = "resync"  # on queue overflow: "resync" or "disconnect"
+    WS_CHANNEL_SYNC_INTERVAL_MS: int = 50  # longest wait before new Redis channel (un)subscriptions are applied
+    WS_COALESCE_WINDOW_MS: int = 100  # updates within this window go out as one batch frame; 0 disables
 
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
@@ -38,6 +38,8 @@ async_session = sessionmaker(
 
 # Redis
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Raw bytes client for binary payloads such as latency sketches
+redis_binary_client = redis.from_url(settings.REDIS_URL)
 
 
 async def create_db_and_tables():
@@ -10,7 +10,7 @@ from fastapi_users.authentication import (
 from fastapi_users.db import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.core.database import get_session
+from app.core.database import async_session, get_session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 
@@ -60,4 +60,18 @@ fastapi_users = FastAPIUsers[User, UUID](
     [auth_backend],
 )
 
-current_active_user = fastapi_users.current_user(active=True)
\ No newline at end of file
+current_active_user = fastapi_users.current_user(active=True)
+
+
+async def get_user_from_token(token: Optional[str]) -> Optional[User]:
+    """Resolve a JWT to an active user outside of a request, e.g. for WebSockets"""
+    if not token:
+        return None
+
+    async with async_session() as session:
+        user_manager = UserManager(SQLAlchemyUserDatabase(session, User))
+        user = await get_jwt_strategy().read_token(token, user_manager)
+
+    if user is None or not user.is_active:
+        return None
+    return user
\ No newline at end of file
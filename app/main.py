@@ -2,12 +2,16 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from starlette.websockets import WebSocket
 
 from app.core.config import settings
 from app.core.database import create_db_and_tables
 from app.routers import monitors_router, websocket_router, auth_router
 from app.workers import monitor_worker
+from app.services.alert_digest import alert_coalescer
+from app.services.alert_outbox import alert_outbox_writer
+from app.services.http_client import probe_client
 from app.services.websocket import websocket_manager
 
 logging.basicConfig(
@@ -24,17 +28,28 @@ async def lifespan(app: FastAPI):
     logger.info("Starting PulseCheck backend...")
     await create_db_and_tables()
 
-    await monitor_worker.start()
+    if settings.EMBEDDED_WORKER:
+        await monitor_worker.start()
+    else:
+        logger.info("Embedded monitor worker disabled; run `python -m app.workers` separately")
 
+    app.state.ready = True
     logger.info("PulseCheck backend started successfully")
 
     yield
 
     logger.info("Shutting down PulseCheck backend...")
+    app.state.ready = False
 
-    await monitor_worker.stop()
+    if settings.EMBEDDED_WORKER:
+        await monitor_worker.stop()
+    else:
+        # Manual checks can leave digest windows open in API processes
+        await alert_coalescer.stop()
+        await alert_outbox_writer.stop()
 
     await websocket_manager.shutdown()
+    await probe_client.close()
 
     logger.info("PulseCheck backend shutdown complete")
 
@@ -55,6 +70,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cross-origin dashboards need to read the monitor list's pagination cursor
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth_router)
@@ -77,6 +94,28 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness of this API process and, if embedded, its monitor worker"""
+    ready = getattr(app.state, "ready", False)
+    body = {"status": "ready" if ready else "not ready", "embedded_worker": settings.EMBEDDED_WORKER}
+
+    if settings.EMBEDDED_WORKER:
+        body["worker_ready"] = monitor_worker.is_ready
+        ready = ready and monitor_worker.is_ready
+
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Worker scheduling and connection metrics"""
+    return {
+        "worker": monitor_worker.get_stats(),
+        "websocket": await websocket_manager.get_connection_stats()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,4 +1,7 @@
 from .monitor import Monitor, MonitorStatus
+from .monitor_check import MonitorCheck
+from .monitor_rollup import MonitorRollup
+from .alert_outbox import AlertOutbox
 from .user import User
 
-__all__ = ["Monitor", "MonitorStatus", "User"]
\ No newline at end of file
+__all__ = ["Monitor", "MonitorStatus", "MonitorCheck", "MonitorRollup", "AlertOutbox", "User"]
\ No newline at end of file
@@ -0,0 +1,36 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import ForeignKey
+from app.core.database import Base
+
+
+class AlertOutbox(Base):
+    """Rendered alert emails waiting for the delivery worker.
+
+    The recipient is copied from the user at enqueue time, so delivery needs
+    no joins or lazy loads.
+    """
+    __tablename__ = "alert_outbox"
+    __table_args__ = (
+        # Claim query: undelivered rows that are due, oldest first
+        Index(
+            "ix_alert_outbox_pending", "next_attempt_at", "id",
+            postgresql_where="sent_at IS NULL AND failed_at IS NULL",
+        ),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(PGUUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(8), nullable=False)  # down, up or digest
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_body = Column(String, nullable=False)
+    text_body = Column(String, nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+    failed_at = Column(DateTime, nullable=True)  # gave up after ALERT_MAX_ATTEMPTS
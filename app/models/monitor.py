@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 from uuid import UUID, uuid4
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import relationship
@@ -16,14 +16,21 @@ class MonitorStatus(str, Enum):
 
 class Monitor(Base):
     __tablename__ = "monitor"
+    __table_args__ = (
+        # Keyset pagination of a user's monitors on (created_at, id)
+        Index("ix_monitor_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     url = Column(String, index=True, nullable=False)
     interval = Column(Integer, default=300)  # seconds
+    method = Column(String(4), default="GET")  # GET or HEAD
+    max_body_bytes = Column(Integer, nullable=True)  # falls back to PROBE_MAX_BODY_BYTES
+    body_keyword = Column(String, nullable=True)
+    body_regex = Column(String, nullable=True)
     status = Column(SQLEnum(MonitorStatus), default=MonitorStatus.UNKNOWN)
     last_latency_ms = Column(Integer, nullable=True)
     last_checked_at = Column(DateTime, nullable=True)
-    last_alert_sent_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
     user_id = Column(PGUUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Integer, DateTime, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import ForeignKey
+from app.core.database import Base
+from app.models.monitor import MonitorStatus
+
+
+class MonitorCheck(Base):
+    """One row per probe, range-partitioned by day on checked_at"""
+    __tablename__ = "monitor_check"
+    __table_args__ = {"postgresql_partition_by": "RANGE (checked_at)"}
+
+    monitor_id = Column(
+        PGUUID(as_uuid=True), ForeignKey("monitor.id", ondelete="CASCADE"), primary_key=True
+    )
+    checked_at = Column(DateTime, primary_key=True)
+    status = Column(SQLEnum(MonitorStatus), nullable=False)
+    latency_ms = Column(Integer, nullable=True)
+    error_message = Column(String, nullable=True)
+
+    # Probe phases in ms; dns/connect/tls are null when a connection was reused
+    dns_ms = Column(Integer, nullable=True)
+    connect_ms = Column(Integer, nullable=True)
+    tls_ms = Column(Integer, nullable=True)
+    ttfb_ms = Column(Integer, nullable=True)
+    transfer_ms = Column(Integer, nullable=True)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, LargeBinary, Index
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import ForeignKey
+from app.core.database import Base
+
+
+class MonitorRollup(Base):
+    """Per-monitor check aggregates for one 1m, 1h or 1d bucket"""
+    __tablename__ = "monitor_rollup"
+    __table_args__ = (
+        Index("ix_monitor_rollup_resolution_bucket", "resolution", "bucket_start"),
+    )
+
+    monitor_id = Column(
+        PGUUID(as_uuid=True), ForeignKey("monitor.id", ondelete="CASCADE"), primary_key=True
+    )
+    resolution = Column(String(2), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+
+    check_count = Column(Integer, nullable=False, default=0)
+    up_count = Column(Integer, nullable=False, default=0)
+    latency_count = Column(Integer, nullable=False, default=0)
+    latency_sum = Column(BigInteger, nullable=False, default=0)
+    latency_min = Column(Integer, nullable=True)
+    latency_max = Column(Integer, nullable=True)
+    latency_sketch = Column(LargeBinary, nullable=True)
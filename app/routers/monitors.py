@@ -1,14 +1,26 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.database import get_session
 from app.deps import current_active_user
-from app.models.monitor import Monitor
+from app.models.monitor import Monitor, MonitorStatus
 from app.models.user import User
-from app.schemas.monitor import MonitorCreate, MonitorUpdate, MonitorResponse
+from app.schemas.monitor import (
+    MonitorCreate, MonitorUpdate, MonitorResponse, MonitorListItem, MonitorStats, LatencyPercentiles, BulkResult
+)
+from app.services import monitor_bulk, status_cache
+from app.services.latency import latency_tracker
+from app.services.monitor_events import (
+    MONITOR_DELETED, MONITOR_UPSERTED, publish_check_result, publish_monitor_changes
+)
+from app.services.rollups import STATS_RANGES, get_monitor_stats
+from app.workers.probe_groups import probe_group_key
 
 router = APIRouter(prefix="/monitors", tags=["monitors"])
 
@@ -24,6 +36,10 @@ async def create_monitor(
         url=str(monitor_data.url),
         interval=monitor_data.interval,
         name=monitor_data.name,
+        method=monitor_data.method,
+        max_body_bytes=monitor_data.max_body_bytes,
+        body_keyword=monitor_data.body_keyword or None,
+        body_regex=monitor_data.body_regex or None,
         user_id=current_user.id,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
@@ -33,22 +49,231 @@ async def create_monitor(
     await session.commit()
     await session.refresh(monitor)
 
+    await status_cache.monitor_changed(monitor)
+    await publish_monitor_changes(MONITOR_UPSERTED, [monitor.id])
+
     return monitor
 
 
-@router.get("/", response_model=List[MonitorResponse])
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines"}
+
+
+def _too_many_items():
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"At most {settings.BULK_MAX_ITEMS} items per request"
+    )
+
+
+async def _read_bulk_items(request: Request) -> List[Any]:
+    """Bulk items from a JSON array body, or from NDJSON streamed one line at a time.
+
+    A malformed NDJSON line becomes an error item instead of failing the batch.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in NDJSON_CONTENT_TYPES:
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Body must be a JSON array or NDJSON"
+            )
+        if not isinstance(items, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Body must be a JSON array"
+            )
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise _too_many_items()
+        return items
+
+    items, buffer = [], b""
+
+    def add_line(line: bytes):
+        if not line.strip():
+            return
+        if len(items) >= settings.BULK_MAX_ITEMS:
+            raise _too_many_items()
+        try:
+            items.append(json.loads(line))
+        except ValueError as e:
+            items.append(monitor_bulk.InvalidItem(f"Invalid JSON: {e}"))
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            add_line(line)
+    add_line(buffer)
+    return items
+
+
+def _bulk_result(items) -> BulkResult:
+    failed = sum(1 for item in items if item.result in ("error", "not_found"))
+    return BulkResult(succeeded=len(items) - failed, failed=failed, items=items)
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_monitors(
+        request: Request,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(current_active_user)
+):
+    """Create many monitors from a JSON array or NDJSON of MonitorCreate objects.
+
+    Valid items are inserted together; invalid ones are reported per item.
+    """
+    items = await _read_bulk_items(request)
+    return _bulk_result(await monitor_bulk.bulk_create(session, current_user.id, items))
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_monitors(
+        request: Request,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(current_active_user)
+):
+    """Update many monitors; each item is a MonitorUpdate with the monitor's id"""
+    items = await _read_bulk_items(request)
+    return _bulk_result(await monitor_bulk.bulk_update(session, current_user.id, items))
+
+
+@router.post("/bulk/pause", response_model=BulkResult)
+async def bulk_pause_monitors(
+        request: Request,
+        paused: bool = Query(True, description="false resumes the monitors"),
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(current_active_user)
+):
+    """Pause or resume many monitors, given a list of monitor ids"""
+    items = await _read_bulk_items(request)
+    return _bulk_result(await monitor_bulk.bulk_set_active(session, current_user.id, items, is_active=not paused))
+
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_monitors(
+        request: Request,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(current_active_user)
+):
+    """Delete many monitors, given a list of monitor ids"""
+    items = await _read_bulk_items(request)
+    return _bulk_result(await monitor_bulk.bulk_delete(session, current_user.id, items))
+
+
+LIST_FIELDS = tuple(MonitorListItem.model_fields)
+STATUS_OVERLAY_FIELDS = {"status", "last_latency_ms", "last_checked_at"}
+
+
+def _encode_cursor(created_at: datetime, monitor_id: UUID) -> str:
+    return urlsafe_b64encode(f"{created_at.isoformat()}|{monitor_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, monitor_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(monitor_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _after(query, after: Optional[Tuple[datetime, UUID]]):
+    if after is None:
+        return query
+    return query.where(tuple_(Monitor.created_at, Monitor.id) < tuple_(*after))
+
+
+async def _rows_with_status(
+        session: AsyncSession, query, after: Optional[Tuple[datetime, UUID]], status_filter: MonitorStatus, limit: int
+) -> Tuple[List[Any], Dict[UUID, dict]]:
+    """Up to limit + 1 rows whose current status matches, with their cached statuses.
+
+    The persisted status lags the worker, so rows are matched on the cached
+    status the response shows, scanning further pages until enough match.
+    """
+    rows, statuses = [], {}
+    while len(rows) <= limit:
+        chunk = (await session.execute(_after(query, after))).mappings().all()
+        cached = await status_cache.get_cached_statuses([row["id"] for row in chunk])
+        for row in chunk:
+            current = cached.get(row["id"])
+            if (current["status"] if current else row["status"]) == status_filter:
+                rows.append(row)
+                if current:
+                    statuses[row["id"]] = current
+        if len(chunk) <= limit:
+            break
+        after = (chunk[-1]["created_at"], chunk[-1]["id"])
+    return rows, statuses
+
+
+@router.get("/", response_model=List[MonitorListItem], response_model_exclude_unset=True)
 async def get_monitors(
+        response: Response,
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = Query(None),
+        status_filter: Optional[MonitorStatus] = Query(None, alias="status"),
+        is_active: Optional[bool] = Query(None),
+        url_prefix: Optional[str] = Query(None, max_length=2048),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
         session: AsyncSession = Depends(get_session),
         current_user: User = Depends(current_active_user)
 ):
-    """Get all monitors for the current user"""
-    result = await session.execute(
-        select(Monitor)
+    """Get a page of the current user's monitors, newest first.
+
+    Pages are keyed on (created_at, id); pass the X-Next-Cursor header of a
+    response as `cursor` to fetch the next page. Rows come from Postgres with
+    the latest status from the Redis status cache laid over them; `status`
+    filters on that overlaid status.
+    """
+    selected = LIST_FIELDS
+    if fields:
+        selected = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        unknown = [field for field in selected if field not in LIST_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+
+    # id and created_at are always read to build the cursor, status to filter on
+    required = ("id", "created_at") + (("status",) if status_filter is not None else ())
+    columns = [getattr(Monitor, field) for field in dict.fromkeys(required + selected)]
+    query = (
+        select(*columns)
         .where(Monitor.user_id == current_user.id)
-        .order_by(Monitor.created_at.desc())
+        .order_by(Monitor.created_at.desc(), Monitor.id.desc())
+        .limit(limit + 1)
     )
+    if is_active is not None:
+        query = query.where(Monitor.is_active == is_active)
+    if url_prefix:
+        query = query.where(Monitor.url.startswith(url_prefix, autoescape=True))
+
+    after = _decode_cursor(cursor) if cursor else None
+    overlay = STATUS_OVERLAY_FIELDS.intersection(selected)
+    if status_filter is None:
+        rows = (await session.execute(_after(query, after))).mappings().all()
+        statuses = await status_cache.get_cached_statuses([row["id"] for row in rows]) if overlay else {}
+    else:
+        rows, statuses = await _rows_with_status(session, query, after, status_filter, limit)
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+    monitors = [{field: row[field] for field in selected} for row in rows]
+
+    # The database status lags the worker by up to a flush interval
+    for row, monitor in zip(rows, monitors):
+        cached = statuses.get(row["id"])
+        if cached and overlay:
+            monitor.update({field: cached[field] for field in overlay})
 
-    monitors = result.scalars().all()
     return monitors
 
 
@@ -58,14 +283,8 @@ async def get_monitor(
         session: AsyncSession = Depends(get_session),
         current_user: User = Depends(current_active_user)
 ):
-    """Get a specific monitor"""
-    result = await session.execute(
-        select(Monitor)
-        .where(Monitor.id == monitor_id)
-        .where(Monitor.user_id == current_user.id)
-    )
-
-    monitor = result.scalar_one_or_none()
+    """Get a specific monitor, from the status cache when it is warm"""
+    monitor = await status_cache.get_monitor(session, monitor_id, current_user.id)
     if not monitor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -95,15 +314,14 @@ async def update_monitor(
             detail="Monitor not found"
         )
 
-    # Update fields
-    if monitor_data.url is not None:
-        monitor.url = str(monitor_data.url)
-    if monitor_data.interval is not None:
-        monitor.interval = monitor_data.interval
-    if monitor_data.name is not None:
-        monitor.name = monitor_data.name
-    if monitor_data.is_active is not None:
-        monitor.is_active = monitor_data.is_active
+    for field, value in monitor_bulk.monitor_update_values(monitor_data).items():
+        setattr(monitor, field, value)
+
+    if monitor_bulk.has_invalid_assertion(monitor.method, monitor.body_keyword, monitor.body_regex):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body assertions require the GET method"
+        )
 
     monitor.updated_at = datetime.utcnow()
 
@@ -111,6 +329,9 @@ async def update_monitor(
     await session.commit()
     await session.refresh(monitor)
 
+    await status_cache.monitor_changed(monitor)
+    await publish_monitor_changes(MONITOR_UPSERTED, [monitor.id])
+
     return monitor
 
 
@@ -136,6 +357,9 @@ async def delete_monitor(
     await session.delete(monitor)
     await session.commit()
 
+    await status_cache.monitor_changed(monitor, deleted=True)
+    await publish_monitor_changes(MONITOR_DELETED, [monitor_id])
+
 
 @router.post("/{monitor_id}/check", response_model=MonitorResponse)
 async def manual_check(
@@ -159,13 +383,67 @@ async def manual_check(
 
     from app.services.uptime import UptimeService
 
+    # Probes go through the shared client, so there is nothing to close here
     uptime_service = UptimeService()
-    try:
-        status_update = await uptime_service.check_monitor(monitor)
-        await uptime_service.update_monitor_status(session, status_update)
+    status_update = await uptime_service.check_monitor(monitor)
+
+    # The owning worker records the result, so its in-memory status (which
+    # drives alerting) and the batched writers see it like a scheduled check
+    await publish_check_result(probe_group_key(monitor), status_update)
+
+    return MonitorResponse.model_validate(monitor).model_copy(update={
+        "status": status_update.status,
+        "last_latency_ms": status_update.latency_ms,
+        "last_checked_at": status_update.checked_at,
+    })
+
+
+@router.get("/{monitor_id}/stats", response_model=MonitorStats)
+async def get_stats(
+        monitor_id: UUID,
+        range_name: str = Query("24h", alias="range"),
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(current_active_user)
+):
+    """Get uptime and latency statistics for a monitor from its rollups"""
+    if range_name not in STATS_RANGES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported range, expected one of: {', '.join(STATS_RANGES)}"
+        )
+
+    result = await session.execute(
+        select(Monitor.id)
+        .where(Monitor.id == monitor_id)
+        .where(Monitor.user_id == current_user.id)
+    )
+
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Monitor not found"
+        )
+
+    return await get_monitor_stats(session, monitor_id, range_name)
+
 
-        await session.refresh(monitor)
-        return monitor
+@router.get("/{monitor_id}/latency", response_model=LatencyPercentiles)
+async def get_latency(
+        monitor_id: UUID,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(current_active_user)
+):
+    """Get live latency percentiles for a monitor from the workers' sketches"""
+    result = await session.execute(
+        select(Monitor.id)
+        .where(Monitor.id == monitor_id)
+        .where(Monitor.user_id == current_user.id)
+    )
+
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Monitor not found"
+        )
 
-    finally:
-        await uptime_service.close()
\ No newline at end of file
+    return await latency_tracker.get_percentiles(monitor_id)
\ No newline at end of file
@@ -1,11 +1,13 @@
 import json
 import logging
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_session
-from app.models.monitor import Monitor
+from app.core.database import async_session, get_session
+from app.deps import get_user_from_token
+from app.services import status_cache
+from app.services.status_stream import read_events_since
 from app.services.websocket import websocket_manager
 
 logger = logging.getLogger(__name__)
@@ -13,26 +15,74 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.websocket("/ws/dashboard")
-async def dashboard_websocket(websocket: WebSocket):
-    from uuid import UUID
+def _status_payload(monitor: dict) -> dict:
+    return {
+        "monitor_id": str(monitor["id"]),
+        "status": monitor["status"],
+        "last_latency_ms": monitor["last_latency_ms"],
+        "last_checked_at": monitor["last_checked_at"],
+    }
+
+
+async def _owned_monitors(user_id: UUID, monitor_ids: Optional[List[UUID]] = None) -> List[dict]:
+    """The user's monitors, optionally limited to the given ids, from the status cache"""
+    async with async_session() as session:
+        if monitor_ids is None:
+            return await status_cache.get_user_monitors(session, user_id)
+        return await status_cache.get_monitors(session, monitor_ids, user_id)
+
 
-    logger.info("Dashboard WebSocket endpoint called")
+def _parse_monitor_ids(message: dict) -> List[UUID]:
+    return [UUID(str(monitor_id)) for monitor_id in message.get("monitor_ids", [])]
 
+
+async def _resume(websocket: WebSocket, monitor_id: UUID, last_event_id: str) -> bool:
+    """Subscribe and replay the events after `last_event_id`; False if the gap can't be replayed"""
+    # Subscribe first so nothing published during the replay read is missed;
+    # clients ignore events at or before the last id they have seen
+    await websocket_manager.connect(websocket, monitor_id)
+    try:
+        events = await read_events_since(monitor_id, last_event_id)
+    except Exception as e:
+        logger.error(f"Failed to read status events for monitor {monitor_id}: {e}")
+        events = None
+
+    if events is None:
+        # Keep the client registered: the caller falls back to a snapshot on this socket
+        websocket_manager.unsubscribe(websocket, [monitor_id])
+        return False
+
+    websocket_manager.send_updates(websocket, events)
+    return True
+
+
+@router.websocket("/ws/dashboard")
+async def dashboard_websocket(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """One authenticated socket carrying updates for all of the user's monitors.
+
+    Connect with ?token=<JWT>. The socket starts subscribed to every monitor
+    the user owns and receives a single snapshot frame for them; clients can
+    then send {"type": "subscribe" | "unsubscribe", "monitor_ids": [...]}.
+    A subscribe may carry "last_event_ids": {monitor_id: event_id} to get the
+    missed events for those monitors instead of their snapshot entries.
+    """
     await websocket.accept()
-    logger.info("Dashboard WebSocket connection accepted")
 
-    # Use a special UUID for dashboard connections
-    dashboard_id = UUID('00000000-0000-0000-0000-000000000000')
+    user = await get_user_from_token(token)
+    if user is None:
+        await websocket.close(code=4401, reason="Unauthorized")
+        return
+
+    logger.info(f"Dashboard WebSocket connection accepted for user {user.id}")
 
     try:
-        logger.info(f"Registering with WebSocket manager using ID: {dashboard_id}")
-        await websocket_manager.connect(websocket, dashboard_id)
-        logger.info("Successfully registered with WebSocket manager")
+        monitors = await _owned_monitors(user.id)
+        websocket_manager.subscribe(websocket, [UUID(monitor["id"]) for monitor in monitors])
 
-        welcome_msg = {"type": "welcome", "message": "Dashboard WebSocket connected"}
-        await websocket.send_json(welcome_msg)
-        logger.info("Sent welcome message")
+        await websocket_manager.send_personal_message(json.dumps({
+            "type": "snapshot",
+            "monitors": [_status_payload(monitor) for monitor in monitors],
+        }), websocket)
 
         while True:
             try:
@@ -41,28 +91,62 @@ async def dashboard_websocket(websocket: WebSocket):
 
                 try:
                     message = json.loads(data)
+                    message_type = message.get("type")
 
-                    if message.get("type") == "ping":
-                        await websocket.send_json({
+                    if message_type == "ping":
+                        await websocket_manager.send_personal_message(json.dumps({
                             "type": "pong",
                             "timestamp": message.get("timestamp")
-                        })
-                        logger.debug("Sent pong response")
-                    else:
-                        # Echo other messages
-                        await websocket.send_json({
-                            "type": "echo",
-                            "received": message
-                        })
-                        logger.debug("Sent echo response")
+                        }), websocket)
+
+                    elif message_type == "subscribe":
+                        # Only the user's own monitors can be subscribed to
+                        monitors = await _owned_monitors(user.id, _parse_monitor_ids(message))
+                        websocket_manager.subscribe(websocket, [UUID(monitor["id"]) for monitor in monitors])
+
+                        # Replay gaps for monitors the client has seen events for;
+                        # the rest get a snapshot entry
+                        last_event_ids = message.get("last_event_ids") or {}
+                        snapshot, replayed = [], []
+                        for monitor in monitors:
+                            events = None
+                            last_event_id = last_event_ids.get(monitor["id"])
+                            if last_event_id:
+                                try:
+                                    events = await read_events_since(UUID(monitor["id"]), str(last_event_id))
+                                except Exception as e:
+                                    logger.error(f"Failed to read status events for monitor {monitor['id']}: {e}")
+                            if events is None:
+                                snapshot.append(_status_payload(monitor))
+                            else:
+                                replayed.extend(events)
+
+                        await websocket_manager.send_personal_message(json.dumps({
+                            "type": "snapshot",
+                            "monitors": snapshot,
+                        }), websocket)
+                        websocket_manager.send_updates(websocket, replayed)
+
+                    elif message_type == "unsubscribe":
+                        monitor_ids = _parse_monitor_ids(message)
+                        websocket_manager.unsubscribe(websocket, monitor_ids)
+                        await websocket_manager.send_personal_message(json.dumps({
+                            "type": "unsubscribed",
+                            "monitor_ids": [str(monitor_id) for monitor_id in monitor_ids],
+                        }), websocket)
 
+                    else:
+                        await websocket_manager.send_personal_message(json.dumps({
+                            "type": "error",
+                            "message": f"Unknown message type: {message_type}"
+                        }), websocket)
 
-                except json.JSONDecodeError:
-                    await websocket.send_json({
+                except (json.JSONDecodeError, AttributeError, ValueError):
+                    await websocket_manager.send_personal_message(json.dumps({
                         "type": "error",
-                        "message": "Invalid JSON format"
-                    })
-                    logger.warning("Received invalid JSON")
+                        "message": "Invalid message format"
+                    }), websocket)
+                    logger.warning("Received invalid dashboard message")
 
             except WebSocketDisconnect:
                 logger.info("Client disconnected normally")
@@ -76,59 +160,49 @@ async def dashboard_websocket(websocket: WebSocket):
         logger.error(f"Error in dashboard WebSocket: {type(e).__name__}: {e}")
         logger.debug("Exception details", exc_info=True)
 
-        try:
-            await websocket.send_json({
-                "type": "error",
-                "message": f"Server error: {str(e)}"
-            })
-        except:
-            pass
-
         try:
             await websocket.close(code=1011, reason="Internal server error")
         except:
             pass
     finally:
-        websocket_manager.disconnect(websocket, dashboard_id)
+        websocket_manager.unregister(websocket)
         logger.info("Unregistered from WebSocket manager")
 
+
 @router.websocket("/ws/{monitor_id}")
 async def websocket_endpoint(
         websocket: WebSocket,
         monitor_id: UUID,
+        last_event_id: Optional[str] = Query(None),
         session: AsyncSession = Depends(get_session)
 ):
 
     await websocket.accept()
 
     try:
-        result = await session.execute(
-            select(Monitor).where(Monitor.id == monitor_id)
-        )
-        monitor = result.scalar_one_or_none()
-
-        if not monitor:
-            logger.warning(f"Monitor not found: {monitor_id}")
-            await websocket.close(code=4004, reason="Monitor not found")
-            return
-
-        logger.info(f"Monitor WebSocket connection established for monitor: {monitor_id}")
-
-        await websocket_manager.connect(websocket, monitor_id)
-
-        initial_status = {
-            "monitor_id": str(monitor_id),
-            "status": monitor.status.value,
-            "last_latency_ms": monitor.last_latency_ms,
-            "last_checked_at": monitor.last_checked_at.isoformat() if monitor.last_checked_at else None,
-            "type": "status_update"
-        }
-
-        await websocket_manager.send_personal_message(
-            json.dumps(initial_status),
-            websocket
-        )
-        logger.debug(f"Sent initial status for monitor: {monitor_id}")
+        # A reconnecting client that sends its last event id gets just the
+        # missed events from the monitor's stream, without a database read
+        if last_event_id and await _resume(websocket, monitor_id, last_event_id):
+            logger.info(f"Monitor WebSocket resumed for monitor: {monitor_id}")
+        else:
+            monitor = await status_cache.get_monitor(session, monitor_id)
+
+            if not monitor:
+                logger.warning(f"Monitor not found: {monitor_id}")
+                await websocket.close(code=4004, reason="Monitor not found")
+                return
+
+            logger.info(f"Monitor WebSocket connection established for monitor: {monitor_id}")
+
+            await websocket_manager.connect(websocket, monitor_id)
+
+            initial_status = {**_status_payload(monitor), "type": "status_update"}
+
+            await websocket_manager.send_personal_message(
+                json.dumps(initial_status),
+                websocket
+            )
+            logger.debug(f"Sent initial status for monitor: {monitor_id}")
 
         while True:
             try:
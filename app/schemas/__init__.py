@@ -1,11 +1,20 @@
-from .monitor import MonitorCreate, MonitorUpdate, MonitorResponse, MonitorStatusUpdate
+from .monitor import (
+    MonitorCreate, MonitorUpdate, MonitorResponse, MonitorListItem, MonitorStatusUpdate, MonitorStats,
+    LatencyPercentiles, BulkMonitorUpdate, BulkItemResult, BulkResult
+)
 from .user import UserRead, UserCreate, UserUpdate
 
 __all__ = [
     "MonitorCreate",
     "MonitorUpdate",
     "MonitorResponse",
+    "MonitorListItem",
     "MonitorStatusUpdate",
+    "MonitorStats",
+    "LatencyPercentiles",
+    "BulkMonitorUpdate",
+    "BulkItemResult",
+    "BulkResult",
     "UserRead",
     "UserCreate",
     "UserUpdate"
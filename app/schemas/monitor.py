@@ -1,14 +1,32 @@
+import re
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, HttpUrl, Field, validator
 from app.models.monitor import MonitorStatus
 
 
+def _validate_body_assertion(v, values):
+    if v:
+        if values.get("body_keyword"):
+            raise ValueError("Set either body_keyword or body_regex, not both")
+        try:
+            re.compile(v.encode())
+        except re.error as e:
+            raise ValueError(f"Invalid body_regex: {e}")
+    if values.get("method") == "HEAD" and (v or values.get("body_keyword")):
+        raise ValueError("Body assertions require the GET method")
+    return v
+
+
 class MonitorCreate(BaseModel):
     url: HttpUrl
     interval: int = Field(default=300, ge=30, le=3600)
     name: Optional[str] = Field(None, max_length=100)
+    method: Literal["GET", "HEAD"] = "GET"
+    max_body_bytes: Optional[int] = Field(None, ge=1, le=10 * 1024 * 1024)
+    body_keyword: Optional[str] = Field(None, max_length=500)
+    body_regex: Optional[str] = Field(None, max_length=500)
 
     @validator("url")
     def validate_url(cls, v):
@@ -17,12 +35,41 @@ class MonitorCreate(BaseModel):
             raise ValueError("URL must start with http:// or https://")
         return url_str
 
+    @validator("body_regex", always=True)
+    def validate_body_regex(cls, v, values):
+        return _validate_body_assertion(v, values)
+
 
 class MonitorUpdate(BaseModel):
     url: Optional[HttpUrl] = None
     interval: Optional[int] = Field(None, ge=30, le=3600)
     name: Optional[str] = Field(None, max_length=100)
     is_active: Optional[bool] = None
+    method: Optional[Literal["GET", "HEAD"]] = None
+    max_body_bytes: Optional[int] = Field(None, ge=1, le=10 * 1024 * 1024)
+    body_keyword: Optional[str] = Field(None, max_length=500)  # "" clears the assertion
+    body_regex: Optional[str] = Field(None, max_length=500)  # "" clears the assertion
+
+    @validator("body_regex", always=True)
+    def validate_body_regex(cls, v, values):
+        return _validate_body_assertion(v, values)
+
+
+class BulkMonitorUpdate(MonitorUpdate):
+    id: UUID
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    result: Literal["created", "updated", "paused", "resumed", "deleted", "not_found", "error"]
+    detail: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    items: List[BulkItemResult]
 
 
 class MonitorResponse(BaseModel):
@@ -36,14 +83,66 @@ class MonitorResponse(BaseModel):
     updated_at: datetime
     name: Optional[str]
     is_active: bool
+    method: Optional[str] = "GET"
+    max_body_bytes: Optional[int] = None
+    body_keyword: Optional[str] = None
+    body_regex: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class MonitorListItem(BaseModel):
+    """A monitor in a list response; only the fields requested with `fields=` are set"""
+    id: Optional[UUID] = None
+    url: Optional[str] = None
+    interval: Optional[int] = None
+    status: Optional[MonitorStatus] = None
+    last_latency_ms: Optional[int] = None
+    last_checked_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    name: Optional[str] = None
+    is_active: Optional[bool] = None
+    method: Optional[str] = None
+    max_body_bytes: Optional[int] = None
+    body_keyword: Optional[str] = None
+    body_regex: Optional[str] = None
+
+
 class MonitorStatusUpdate(BaseModel):
     monitor_id: UUID
     status: MonitorStatus
     latency_ms: Optional[int]
     checked_at: datetime
-    error_message: Optional[str] = None
\ No newline at end of file
+    error_message: Optional[str] = None
+    dns_ms: Optional[int] = None
+    connect_ms: Optional[int] = None
+    tls_ms: Optional[int] = None
+    ttfb_ms: Optional[int] = None
+    transfer_ms: Optional[int] = None
+
+
+class MonitorStats(BaseModel):
+    monitor_id: UUID
+    range: str
+    resolution: str
+    checks: int
+    up_checks: int
+    uptime_percentage: Optional[float]
+    avg_latency_ms: Optional[float]
+    min_latency_ms: Optional[int]
+    max_latency_ms: Optional[int]
+    p50_latency_ms: Optional[float]
+    p95_latency_ms: Optional[float]
+    p99_latency_ms: Optional[float]
+
+
+class LatencyPercentiles(BaseModel):
+    monitor_id: UUID
+    window_seconds: int
+    samples: int
+    p50_latency_ms: Optional[float]
+    p90_latency_ms: Optional[float]
+    p95_latency_ms: Optional[float]
+    p99_latency_ms: Optional[float]
\ No newline at end of file
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from typing import Dict, List
+from uuid import UUID
+from app.core.config import settings
+from app.core.database import redis_client
+from app.services.alert_outbox import alert_outbox_writer
+from app.services.email import ALERT_DOWN, AlertEvent, EmailService
+
+logger = logging.getLogger(__name__)
+
+# Debounces the transition and appends it to the user's digest, atomically.
+# A DOWN alert is dropped while the monitor's debounce key exists; an UP
+# notice is only sent for an outage that was alerted (its open key exists).
+# Returns -1 if suppressed, 1 if the caller opened the digest window and
+# must flush it, 0 if the event joined a window opened elsewhere.
+# KEYS: debounce, open outage, digest list, digest window.
+# ARGV: kind, debounce s, open outage ttl s, event, window ms, list ttl ms.
+QUEUE_ALERT_SCRIPT = """
+if ARGV[1] == 'down' then
+  if not redis.call('SET', KEYS[1], '1', 'NX', 'EX', ARGV[2]) then return -1 end
+  redis.call('SET', KEYS[2], '1', 'EX', ARGV[3])
+elseif redis.call('DEL', KEYS[2]) == 0 then
+  return -1
+end
+redis.call('RPUSH', KEYS[3], ARGV[4])
+redis.call('PEXPIRE', KEYS[3], ARGV[6])
+if redis.call('SET', KEYS[4], '1', 'NX', 'PX', ARGV[5]) then return 1 end
+return 0
+"""
+
+# Takes a user's pending events once their window key has expired without the
+# owning worker flushing them, e.g. because it died mid-window.
+# KEYS: digest list, digest window.
+TAKE_ORPHANED_DIGEST_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then return {} end
+local events = redis.call('LRANGE', KEYS[1], 0, -1)
+redis.call('DEL', KEYS[1])
+return events
+"""
+
+_queue_script = redis_client.register_script(QUEUE_ALERT_SCRIPT)
+_take_orphaned_script = redis_client.register_script(TAKE_ORPHANED_DIGEST_SCRIPT)
+
+
+def alert_debounce_key(monitor_id: str) -> str:
+    return f"alert_debounce:{monitor_id}"
+
+
+def alert_open_key(monitor_id: str) -> str:
+    return f"alert_open:{monitor_id}"
+
+
+def alert_digest_key(user_id: str) -> str:
+    return f"alert_digest:{user_id}"
+
+
+def alert_digest_window_key(user_id: str) -> str:
+    return f"alert_digest_window:{user_id}"
+
+
+class AlertCoalescer:
+    """Groups DOWN/UP transitions per recipient into one digest per window.
+
+    Pending events live in a Redis list per user, so transitions detected by
+    different workers during the same outage land in the same digest. The
+    worker that opens a user's window flushes it when the window ends; lists
+    left behind by a worker that died mid-window are picked up by `sweep`.
+    Debounce state is kept in Redis with a TTL instead of on the monitor row.
+    """
+
+    def __init__(self):
+        self.email_service = EmailService()
+        self._flushes: Dict[str, asyncio.Task] = {}
+
+        # Stats
+        self.events = 0
+        self.suppressed = 0
+        self.digests = 0
+        self.orphans_swept = 0
+        self.errors = 0
+
+    async def add(self, event: AlertEvent):
+        """Debounce a transition and queue it for its owner's next digest"""
+        window_ms = int(settings.ALERT_DIGEST_WINDOW_SECONDS * 1000)
+        try:
+            result = await _queue_script(
+                keys=[
+                    alert_debounce_key(event.monitor_id),
+                    alert_open_key(event.monitor_id),
+                    alert_digest_key(event.user_id),
+                    alert_digest_window_key(event.user_id),
+                ],
+                args=[
+                    event.kind,
+                    settings.EMAIL_DEBOUNCE_MINUTES * 60,
+                    settings.ALERT_RECOVERY_TTL_SECONDS,
+                    event.to_json(),
+                    window_ms,
+                    # Outlives the window so a crashed owner's events wait for the sweep
+                    window_ms * 10,
+                ],
+            )
+        except Exception as e:
+            # Without Redis there is no debounce state; only alert outages
+            self.errors += 1
+            logger.error(f"Failed to queue alert for monitor {event.monitor_id}: {e}")
+            if event.kind == ALERT_DOWN:
+                await self._send([event])
+            return
+
+        if result == -1:
+            self.suppressed += 1
+            return
+
+        self.events += 1
+        if result == 1 and event.user_id not in self._flushes:
+            self._flushes[event.user_id] = asyncio.create_task(self._flush_later(event.user_id))
+
+    async def _flush_later(self, user_id: str):
+        try:
+            await asyncio.sleep(settings.ALERT_DIGEST_WINDOW_SECONDS)
+        finally:
+            self._flushes.pop(user_id, None)
+        await self.flush(user_id)
+
+    async def flush(self, user_id: str):
+        """Take every pending event for the user and queue one email for them"""
+        key = alert_digest_key(user_id)
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.lrange(key, 0, -1)
+                pipe.delete(key)
+                raw_events, _ = await pipe.execute()
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to read alert digest for user {user_id}: {e}")
+            return
+
+        if raw_events:
+            await self._send([AlertEvent.from_json(raw) for raw in raw_events])
+
+    async def sweep(self):
+        """Send the pending events of every user whose window closed without a flush"""
+        prefix = alert_digest_key("")
+        async for key in redis_client.scan_iter(match=f"{prefix}*", count=500):
+            user_id = key[len(prefix):]
+            raw_events = await _take_orphaned_script(keys=[key, alert_digest_window_key(user_id)])
+            if raw_events:
+                self.orphans_swept += 1
+                logger.warning(f"Sending alert digest for user {user_id} left behind by another worker")
+                await self._send([AlertEvent.from_json(raw) for raw in raw_events])
+
+    async def _send(self, events: List[AlertEvent]):
+        message = self.email_service.render_digest(events, settings.ALERT_DIGEST_MAX_ITEMS)
+        kind = events[0].kind if len(events) == 1 else "digest"
+        alert_outbox_writer.add_alert(UUID(events[0].user_id), kind, message)
+        self.digests += 1
+        # Digests are rare, so write them right away rather than waiting for the writer loop
+        await alert_outbox_writer.flush()
+
+    async def stop(self):
+        """Flush open windows now instead of leaving them to expire"""
+        tasks = list(self._flushes.items())
+        self._flushes.clear()
+        for _, task in tasks:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+        for user_id, _ in tasks:
+            await self.flush(user_id)
+
+    def get_stats(self) -> dict:
+        return {
+            "events": self.events,
+            "suppressed": self.suppressed,
+            "digests": self.digests,
+            "open_windows": len(self._flushes),
+            "orphans_swept": self.orphans_swept,
+            "errors": self.errors,
+        }
+
+
+# Global alert coalescer instance
+alert_coalescer = AlertCoalescer()
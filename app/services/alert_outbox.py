@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import DateTime, String, column, insert, select, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.alert_outbox import AlertOutbox
+from app.models.user import User
+from app.services.batching import BatchWriter
+from app.services.email import EmailTransport, get_email_transport
+
+logger = logging.getLogger(__name__)
+
+
+class AlertOutboxWriter(BatchWriter):
+    """Writes rendered alerts to the outbox as one INSERT ... SELECT per flush.
+
+    The recipient's email is joined in by the insert, so the alert path never
+    loads the user relationship. Failed writes are kept for the next flush.
+    """
+
+    name = "alert_outbox"
+
+    def _requeue(self, batch):
+        self._buffer[:0] = batch
+
+    def add_alert(self, user_id: UUID, kind: str, message: Dict[str, str]):
+        self.add((user_id, kind, message["Subject"], message["HtmlBody"], message["TextBody"], datetime.utcnow()))
+
+    async def _write(self, batch):
+        v = values(
+            column("user_id", PGUUID(as_uuid=True)),
+            column("kind", String),
+            column("subject", String),
+            column("html_body", String),
+            column("text_body", String),
+            column("created_at", DateTime),
+            name="v",
+        ).data(batch)
+
+        stmt = insert(AlertOutbox).from_select(
+            ["user_id", "kind", "recipient", "subject", "html_body", "text_body", "created_at", "next_attempt_at"],
+            select(v.c.user_id, v.c.kind, User.email, v.c.subject, v.c.html_body, v.c.text_body,
+                   v.c.created_at, v.c.created_at)
+            .join(User, User.id == v.c.user_id)
+        )
+
+        async with async_session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+        alert_delivery.wake()
+
+
+class AlertDeliveryWorker:
+    """Sends outbox rows in batches, retrying failures with exponential backoff.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so every worker process can
+    run a delivery loop without sending the same alert twice. Delivery is
+    at-least-once: a crash between sending and committing resends the batch.
+    The loop also sweeps up digests whose owning worker died mid-window.
+    """
+
+    def __init__(self, transport: Optional[EmailTransport] = None):
+        self.transport = transport or get_email_transport()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_sweep = 0.0
+
+        # Stats
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.batches = 0
+
+    def wake(self):
+        """Deliver right away instead of waiting for the next poll"""
+        self._wake.set()
+
+    def retry_delay(self, attempts: int) -> float:
+        delay = min(settings.ALERT_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.ALERT_RETRY_MAX_SECONDS)
+        # Jitter keeps a batch that failed together from retrying together
+        return delay * random.uniform(0.8, 1.2)
+
+    async def deliver_batch(self) -> int:
+        """Claim, send and record one batch of due alerts; returns the batch size"""
+        now = datetime.utcnow()
+        async with async_session() as session:
+            result = await session.execute(
+                select(AlertOutbox)
+                .where(AlertOutbox.sent_at.is_(None))
+                .where(AlertOutbox.failed_at.is_(None))
+                .where(AlertOutbox.next_attempt_at <= now)
+                .order_by(AlertOutbox.next_attempt_at, AlertOutbox.id)
+                .limit(settings.ALERT_DELIVERY_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            rows: List[AlertOutbox] = list(result.scalars().all())
+            if not rows:
+                return 0
+
+            messages = [
+                {"To": row.recipient, "Subject": row.subject, "HtmlBody": row.html_body, "TextBody": row.text_body}
+                for row in rows
+            ]
+            try:
+                errors = await self.transport.send_batch(messages)
+            except Exception as e:
+                errors = [str(e)] * len(rows)
+
+            now = datetime.utcnow()
+            for row, error in zip(rows, errors):
+                row.attempts += 1
+                if error is None:
+                    row.sent_at = now
+                    row.last_error = None
+                    self.sent += 1
+                elif row.attempts >= settings.ALERT_MAX_ATTEMPTS:
+                    row.failed_at = now
+                    row.last_error = error
+                    self.failed += 1
+                    logger.error(f"Giving up on alert {row.id} to {row.recipient}: {error}")
+                else:
+                    row.next_attempt_at = now + timedelta(seconds=self.retry_delay(row.attempts))
+                    row.last_error = error
+                    self.retried += 1
+                    logger.warning(f"Alert {row.id} failed (attempt {row.attempts}), retrying: {error}")
+
+            await session.commit()
+
+        self.batches += 1
+        return len(rows)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._delivery_loop())
+            logger.info(f"Alert delivery started ({self.transport.name} transport)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Alert delivery stopped")
+
+    async def _delivery_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.ALERT_DELIVERY_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            if time.monotonic() - self._last_sweep >= settings.ALERT_DIGEST_WINDOW_SECONDS:
+                self._last_sweep = time.monotonic()
+                await self._sweep_digests()
+
+            try:
+                # Keep going while batches come back full
+                while await self.deliver_batch() >= settings.ALERT_DELIVERY_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                logger.error(f"Error delivering alerts: {e}")
+
+    async def _sweep_digests(self):
+        # Imported here: the coalescer writes through this module's outbox writer
+        from app.services.alert_digest import alert_coalescer
+
+        try:
+            await alert_coalescer.sweep()
+        except Exception as e:
+            logger.error(f"Error sweeping alert digests: {e}")
+
+    def get_stats(self) -> dict:
+        return {
+            "transport": self.transport.name,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+# Global alert outbox writer instance
+alert_outbox_writer = AlertOutboxWriter(
+    max_batch=settings.ALERT_OUTBOX_MAX_BATCH,
+    flush_interval=settings.ALERT_OUTBOX_FLUSH_INTERVAL,
+)
+
+# Global alert delivery instance
+alert_delivery = AlertDeliveryWorker()
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """Buffers items in memory and writes them in batches.
+
+    A batch is flushed when `max_batch` items are pending or every
+    `flush_interval` seconds, whichever comes first. Subclasses implement
+    `_write` and may change how items are buffered by overriding
+    `_new_buffer`/`_append`.
+    """
+
+    name = "batch"
+
+    def __init__(self, max_batch: int, flush_interval: float):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._buffer = self._new_buffer()
+        self._flush_requested = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.flushes = 0
+        self.items_written = 0
+        self.errors = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+
+    def _new_buffer(self) -> Any:
+        return []
+
+    def _append(self, item):
+        self._buffer.append(item)
+
+    def _requeue(self, batch):
+        """Called with a batch whose write failed; dropped by default"""
+        logger.warning(f"Dropping {len(batch)} {self.name} items after failed write")
+
+    async def _write(self, batch):
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, item):
+        """Buffer an item, requesting an early flush once the batch is full"""
+        self._append(item)
+        if len(self._buffer) >= self.max_batch:
+            self._flush_requested.set()
+
+    async def flush(self):
+        """Write everything buffered so far"""
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            batch, self._buffer = self._buffer, self._new_buffer()
+            start = time.perf_counter()
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Failed to write {self.name} batch of {len(batch)}: {e}")
+                self._requeue(batch)
+                return
+
+            self.flushes += 1
+            self.items_written += len(batch)
+            self.last_batch_size = len(batch)
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+            logger.info(f"{self.name} writer started")
+
+    async def stop(self):
+        """Stop the flush loop and write whatever is still buffered"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+        logger.info(f"{self.name} writer stopped")
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    def get_stats(self) -> dict:
+        return {
+            "pending": len(self._buffer),
+            "flushes": self.flushes,
+            "items_written": self.items_written,
+            "errors": self.errors,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
@@ -0,0 +1,139 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Iterable, Set
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import engine
+from app.models.monitor import Monitor
+from app.models.monitor_check import MonitorCheck
+from app.schemas.monitor import MonitorStatusUpdate
+from app.services.batching import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+HISTORY_COLUMNS = [
+    "monitor_id", "checked_at", "status", "latency_ms", "error_message",
+    "dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "transfer_ms",
+]
+
+
+def partition_name(day: date) -> str:
+    return f"{MonitorCheck.__tablename__}_p{day:%Y%m%d}"
+
+
+class CheckHistoryWriter(BatchWriter):
+    """Buffers every probe result and bulk-loads them into monitor_check with COPY.
+
+    Rows are copied into a temporary staging table and moved over with an
+    INSERT ... SELECT joining monitor, so rows of a monitor deleted before the
+    flush are skipped instead of failing the whole COPY on the foreign key.
+    Daily partitions are created on demand before a batch that needs them is
+    written, and partitions older than CHECK_HISTORY_RETENTION_DAYS are dropped.
+    """
+
+    name = "check history"
+
+    def __init__(self, max_batch: int, flush_interval: float):
+        super().__init__(max_batch, flush_interval)
+        self._partitions: Set[date] = set()
+        self._last_retention_day = None
+
+    def _requeue(self, batch):
+        # Keep failed rows for the next flush, up to a bounded backlog
+        room = self.max_batch * 10 - len(self._buffer)
+        if room < len(batch):
+            logger.warning(f"Dropping {len(batch) - max(room, 0)} check history rows after failed write")
+        if room > 0:
+            self._buffer[:0] = batch[-room:]
+
+    def add(self, status_update: MonitorStatusUpdate):
+        super().add((
+            status_update.monitor_id,
+            status_update.checked_at,
+            status_update.status.name,
+            status_update.latency_ms,
+            status_update.error_message,
+            status_update.dns_ms,
+            status_update.connect_ms,
+            status_update.tls_ms,
+            status_update.ttfb_ms,
+            status_update.transfer_ms,
+        ))
+
+    async def ensure_partitions(self, days: Iterable[date]):
+        """Create the daily partitions for the given days if they are missing"""
+        missing = sorted(set(days) - self._partitions)
+        if not missing:
+            return
+
+        async with engine.begin() as conn:
+            for day in missing:
+                await conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(day)} "
+                    f"PARTITION OF {MonitorCheck.__tablename__} "
+                    f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+                ))
+        self._partitions.update(missing)
+
+    async def drop_expired_partitions(self):
+        """Drop daily partitions that fall outside the retention window"""
+        today = datetime.utcnow().date()
+        if self._last_retention_day == today:
+            return
+
+        cutoff = today - timedelta(days=settings.CHECK_HISTORY_RETENTION_DAYS)
+        async with engine.begin() as conn:
+            result = await conn.execute(text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = :parent"
+            ), {"parent": MonitorCheck.__tablename__})
+
+            for (name,) in result.all():
+                try:
+                    day = datetime.strptime(name.rsplit("_p", 1)[1], "%Y%m%d").date()
+                except (IndexError, ValueError):
+                    continue
+                if day < cutoff:
+                    await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    self._partitions.discard(day)
+                    logger.info(f"Dropped expired check history partition {name}")
+
+        self._last_retention_day = today
+
+    async def _write(self, batch):
+        await self.ensure_partitions({row[1].date() for row in batch})
+
+        table = MonitorCheck.__tablename__
+        staging = f"{table}_staging"
+        columns = ", ".join(HISTORY_COLUMNS)
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA"
+            ))
+            raw_connection = await conn.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                staging,
+                records=batch,
+                columns=HISTORY_COLUMNS,
+            )
+            await conn.execute(text(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {', '.join(f's.{name}' for name in HISTORY_COLUMNS)} FROM {staging} s "
+                f"JOIN {Monitor.__tablename__} m ON m.id = s.monitor_id FOR KEY SHARE OF m "
+                # A requeued batch may already be partly written
+                f"ON CONFLICT (monitor_id, checked_at) DO NOTHING"
+            ))
+
+        try:
+            await self.drop_expired_partitions()
+        except Exception as e:
+            logger.error(f"Failed to drop expired check history partitions: {e}")
+
+
+# Global check history writer instance
+check_history_writer = CheckHistoryWriter(
+    max_batch=settings.CHECK_HISTORY_FLUSH_MAX_BATCH,
+    flush_interval=settings.CHECK_HISTORY_FLUSH_INTERVAL,
+)
@@ -0,0 +1,167 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+import httpcore
+from app.core.config import settings
+from app.services.probe import current_probe_timings
+
+logger = logging.getLogger(__name__)
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+class DNSCache:
+    """Async hostname cache that honours record TTLs.
+
+    Lookups go through dnspython's async resolver, falling back to the system
+    resolver (getaddrinfo, which also reads /etc/hosts) when that fails.
+    Concurrent lookups for the same hostname share one query.
+    """
+
+    def __init__(self, min_ttl: float, max_ttl: float, fallback_ttl: float):
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.fallback_ttl = fallback_ttl
+        self._resolver: Optional[dns.asyncresolver.Resolver] = None
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.shared_lookups = 0
+        self.fallbacks = 0
+
+    async def resolve(self, host: str) -> List[str]:
+        """Return the cached addresses for a hostname, resolving on expiry"""
+        entry = self._entries.get(host)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        # One lookup task per hostname; callers are shielded from each other's cancellation
+        task = self._pending.get(host)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._refresh(host))
+            self._pending[host] = task
+            task.add_done_callback(lambda done: self._lookup_done(host, done))
+        else:
+            self.shared_lookups += 1
+        return await asyncio.shield(task)
+
+    async def _refresh(self, host: str) -> List[str]:
+        addresses, ttl = await self._lookup(host)
+        self._entries[host] = (time.monotonic() + ttl, addresses)
+        return addresses
+
+    def _lookup_done(self, host: str, task: asyncio.Task):
+        self._pending.pop(host, None)
+        if not task.cancelled():
+            # Retrieve the exception so a lookup nobody waited for is not reported as unhandled
+            task.exception()
+
+    async def _lookup(self, host: str) -> Tuple[List[str], float]:
+        if self._resolver is None:
+            self._resolver = dns.asyncresolver.Resolver()
+
+        for rdtype in ("A", "AAAA"):
+            try:
+                answer = await self._resolver.resolve(host, rdtype)
+            except dns.resolver.NoAnswer:
+                continue
+            except dns.exception.DNSException:
+                break
+            ttl = min(max(answer.rrset.ttl, self.min_ttl), self.max_ttl)
+            return [record.address for record in answer], ttl
+
+        self.fallbacks += 1
+        logger.debug(f"Resolving {host} through getaddrinfo")
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if not addresses:
+            raise OSError(f"No addresses found for {host}")
+        return addresses, self.fallback_ttl
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached_hosts": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_lookups": self.shared_lookups,
+            "fallbacks": self.fallbacks,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that resolves hostnames through a DNSCache.
+
+    TLS still uses the original hostname for SNI and certificate checks, since
+    httpcore passes the origin host to start_tls separately. Resolution time
+    is recorded on the current probe's timings.
+    """
+
+    def __init__(self, cache: DNSCache, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.cache = cache
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+            self,
+            host: str,
+            port: int,
+            timeout: Optional[float] = None,
+            local_address: Optional[str] = None,
+            socket_options: Optional[Iterable] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        if _is_ip_address(host):
+            return await self._backend.connect_tcp(host, port, timeout, local_address, socket_options)
+
+        started = time.monotonic()
+        try:
+            addresses = await asyncio.wait_for(self.cache.resolve(host), timeout)
+        except asyncio.TimeoutError:
+            raise httpcore.ConnectTimeout(f"DNS lookup for {host} timed out")
+        except OSError as e:
+            raise httpcore.ConnectError(f"DNS lookup for {host} failed: {e}")
+        elapsed = time.monotonic() - started
+
+        timings = current_probe_timings.get()
+        if timings is not None:
+            timings.dns_ms = int(elapsed * 1000)
+
+        remaining = None if timeout is None else max(timeout - elapsed, 0.001)
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, remaining, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+# Global DNS cache instance
+dns_cache = DNSCache(
+    min_ttl=settings.DNS_CACHE_MIN_TTL,
+    max_ttl=settings.DNS_CACHE_MAX_TTL,
+    fallback_ttl=settings.DNS_CACHE_FALLBACK_TTL,
+)
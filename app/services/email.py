@@ -1,81 +1,236 @@
+import asyncio
 import logging
-from typing import Optional
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
 from postmarker.core import PostmarkClient
 from app.core.config import settings
 from app.models.monitor import Monitor
 
 logger = logging.getLogger(__name__)
 
+ALERT_DOWN = "down"
+ALERT_UP = "up"
+
+
+@dataclass
+class AlertEvent:
+    """A DOWN or UP transition, with what the alert templates need from the monitor"""
+
+    monitor_id: str
+    user_id: str
+    kind: str
+    url: str
+    name: Optional[str]
+    interval: int
+    checked_at: str
+    latency_ms: Optional[int] = None
+    error_message: Optional[str] = None
+
+    @classmethod
+    def from_monitor(cls, monitor: Monitor, kind: str, checked_at: datetime,
+                     latency_ms: Optional[int] = None, error_message: Optional[str] = None) -> "AlertEvent":
+        return cls(
+            monitor_id=str(monitor.id),
+            user_id=str(monitor.user_id),
+            kind=kind,
+            url=monitor.url,
+            name=monitor.name,
+            interval=monitor.interval,
+            checked_at=checked_at.isoformat(),
+            latency_ms=latency_ms,
+            error_message=error_message,
+        )
+
+    @property
+    def label(self) -> str:
+        return self.name or self.url
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "AlertEvent":
+        return cls(**json.loads(data))
+
+
+class EmailTransport:
+    """Sends a batch of messages, returning an error (or None) for each one in order"""
+
+    name = "base"
+
+    async def send_batch(self, messages: List[Dict[str, str]]) -> List[Optional[str]]:
+        raise NotImplementedError
+
+
+class PostmarkTransport(EmailTransport):
+    """Postmark's batch API; the client is synchronous, so calls run in a thread"""
+
+    name = "postmark"
+
+    def __init__(self, server_token: str):
+        self.client = PostmarkClient(server_token=server_token)
+
+    def _send(self, messages: List[Dict[str, str]]) -> List[Optional[str]]:
+        responses = self.client.emails.send_batch(*(dict(message, From=settings.EMAIL_FROM) for message in messages))
+        return [
+            None if response.get("ErrorCode") == 0 else f"{response.get('ErrorCode')}: {response.get('Message')}"
+            for response in responses
+        ]
+
+    async def send_batch(self, messages: List[Dict[str, str]]) -> List[Optional[str]]:
+        return await asyncio.to_thread(self._send, messages)
+
+
+class LogTransport(EmailTransport):
+    """Development mode - log to console"""
+
+    name = "log"
+
+    async def send_batch(self, messages: List[Dict[str, str]]) -> List[Optional[str]]:
+        for message in messages:
+            logger.info(f"EMAIL (DEV MODE) to {message['To']}: {message['Subject']}")
+            logger.info(f"Body: {message['TextBody']}")
+        return [None] * len(messages)
+
+
+class FakeTransport(EmailTransport):
+    """Records messages in memory for tests; `fail_with` makes every send fail"""
+
+    name = "fake"
+
+    def __init__(self, fail_with: Optional[str] = None):
+        self.sent: List[Dict[str, str]] = []
+        self.batches = 0
+        self.fail_with = fail_with
+
+    async def send_batch(self, messages: List[Dict[str, str]]) -> List[Optional[str]]:
+        self.batches += 1
+        if self.fail_with:
+            return [self.fail_with] * len(messages)
+        self.sent.extend(messages)
+        return [None] * len(messages)
+
+
+def get_email_transport() -> EmailTransport:
+    if settings.POSTMARK_API_TOKEN and not settings.EMAIL_DEV_MODE:
+        return PostmarkTransport(settings.POSTMARK_API_TOKEN)
+    return LogTransport()
+
 
 class EmailService:
-    def __init__(self):
-        self.client = None
-        if settings.POSTMARK_API_TOKEN and not settings.EMAIL_DEV_MODE:
-            self.client = PostmarkClient(server_token=settings.POSTMARK_API_TOKEN)
+    """Renders alert emails; delivery goes through the alert outbox"""
 
-    async def send_down_alert(self, monitor: Monitor, error_message: Optional[str] = None):
-        """Send email alert when monitor goes down"""
-        subject = f"🔴 {monitor.name or monitor.url} is DOWN"
+    def render_down_alert(self, event: AlertEvent) -> Dict[str, str]:
+        """Alert for a monitor going down"""
+        subject = f"🔴 {event.label} is DOWN"
 
-        error_text = f"\nError: {error_message}" if error_message else ""
+        error_text = f"\nError: {event.error_message}" if event.error_message else ""
 
         html_body = f"""
         <h2>Monitor Alert</h2>
-        <p><strong>{monitor.name or monitor.url}</strong> is currently down.</p>
-        <p><strong>URL:</strong> <a href="{monitor.url}">{monitor.url}</a></p>
-        <p><strong>Check Interval:</strong> {monitor.interval} seconds</p>
-        <p><strong>Last Checked:</strong> {monitor.last_checked_at}</p>
-        {f"<p><strong>Error:</strong> {error_message}</p>" if error_message else ""}
+        <p><strong>{event.label}</strong> is currently down.</p>
+        <p><strong>URL:</strong> <a href="{event.url}">{event.url}</a></p>
+        <p><strong>Check Interval:</strong> {event.interval} seconds</p>
+        <p><strong>Last Checked:</strong> {event.checked_at}</p>
+        {f"<p><strong>Error:</strong> {event.error_message}</p>" if event.error_message else ""}
         <hr>
         <p>This is an automated alert from PulseCheck.</p>
         """
 
         text_body = f"""
-        Monitor Alert: {monitor.name or monitor.url} is DOWN
+        Monitor Alert: {event.label} is DOWN
 
-        URL: {monitor.url}
-        Check Interval: {monitor.interval} seconds
-        Last Checked: {monitor.last_checked_at}
+        URL: {event.url}
+        Check Interval: {event.interval} seconds
+        Last Checked: {event.checked_at}
         {error_text}
 
         This is an automated alert from PulseCheck.
         """
 
-        if self.client and not settings.EMAIL_DEV_MODE:
-            try:
-
-                to_email = monitor.user.email
-
-                self.client.emails.send(
-                    From=settings.EMAIL_FROM,
-                    To=to_email,
-                    Subject=subject,
-                    HtmlBody=html_body,
-                    TextBody=text_body,
-                )
-                logger.info(f"Alert email sent for monitor {monitor.id}")
-            except Exception as e:
-                logger.error(f"Failed to send email alert: {e}")
-        else:
-            # Development mode - log to console
-            logger.info(f"EMAIL ALERT (DEV MODE):")
-            logger.info(f"Subject: {subject}")
-            logger.info(f"Body: {text_body}")
-
-    async def send_up_alert(self, monitor: Monitor):
-        """Send email alert when monitor comes back up"""
-        subject = f"✅ {monitor.name or monitor.url} is UP"
+        return {"Subject": subject, "HtmlBody": html_body, "TextBody": text_body}
+
+    def render_up_alert(self, event: AlertEvent) -> Dict[str, str]:
+        """Notification for a monitor coming back up"""
+        subject = f"✅ {event.label} is UP"
 
         html_body = f"""
         <h2>Monitor Recovery</h2>
-        <p><strong>{monitor.name or monitor.url}</strong> is back online!</p>
-        <p><strong>URL:</strong> <a href="{monitor.url}">{monitor.url}</a></p>
-        <p><strong>Response Time:</strong> {monitor.last_latency_ms}ms</p>
-        <p><strong>Recovered At:</strong> {monitor.last_checked_at}</p>
+        <p><strong>{event.label}</strong> is back online!</p>
+        <p><strong>URL:</strong> <a href="{event.url}">{event.url}</a></p>
+        <p><strong>Response Time:</strong> {event.latency_ms}ms</p>
+        <p><strong>Recovered At:</strong> {event.checked_at}</p>
         <hr>
         <p>This is an automated notification from PulseCheck.</p>
         """
 
-        if settings.EMAIL_DEV_MODE:
-            logger.info(f"EMAIL RECOVERY (DEV MODE): {subject}")
-            logger.info(f"Monitor {monitor.name or monitor.url} is back up!")
\ No newline at end of file
+        text_body = f"""
+        Monitor Recovery: {event.label} is back UP
+
+        URL: {event.url}
+        Response Time: {event.latency_ms}ms
+        Recovered At: {event.checked_at}
+
+        This is an automated notification from PulseCheck.
+        """
+
+        return {"Subject": subject, "HtmlBody": html_body, "TextBody": text_body}
+
+    def render_alert(self, event: AlertEvent) -> Dict[str, str]:
+        if event.kind == ALERT_DOWN:
+            return self.render_down_alert(event)
+        return self.render_up_alert(event)
+
+    def render_digest(self, events: List[AlertEvent], max_items: int) -> Dict[str, str]:
+        """One email summarizing several transitions, e.g. during a shared upstream outage"""
+        if len(events) == 1:
+            return self.render_alert(events[0])
+
+        down = [event for event in events if event.kind == ALERT_DOWN]
+        up = [event for event in events if event.kind != ALERT_DOWN]
+        counts = []
+        if down:
+            counts.append(f"🔴 {len(down)} monitor{'s' if len(down) != 1 else ''} DOWN")
+        if up:
+            counts.append(f"✅ {len(up)} monitor{'s' if len(up) != 1 else ''} UP")
+        subject = ", ".join(counts)
+
+        shown = events[:max_items]
+        more = len(events) - len(shown)
+
+        rows = "".join(
+            f"<tr><td>{'DOWN' if event.kind == ALERT_DOWN else 'UP'}</td>"
+            f"<td><a href=\"{event.url}\">{event.label}</a></td>"
+            f"<td>{event.checked_at}</td>"
+            f"<td>{event.error_message if event.kind == ALERT_DOWN else f'{event.latency_ms}ms'}</td></tr>"
+            for event in shown
+        )
+        html_body = f"""
+        <h2>Monitor Digest</h2>
+        <p>{subject}</p>
+        <table>
+        <tr><th>Status</th><th>Monitor</th><th>Checked At</th><th>Details</th></tr>
+        {rows}
+        </table>
+        {f"<p>...and {more} more.</p>" if more else ""}
+        <hr>
+        <p>This is an automated alert from PulseCheck.</p>
+        """
+
+        lines = "\n".join(
+            f"        {'DOWN' if event.kind == ALERT_DOWN else 'UP  '}  {f'{event.name}: ' if event.name else ''}{event.url}"
+            f"{f' - {event.error_message}' if event.kind == ALERT_DOWN and event.error_message else ''}"
+            for event in shown
+        )
+        text_body = f"""
+        Monitor Digest: {subject}
+
+{lines}
+        {f"...and {more} more." if more else ""}
+
+        This is an automated alert from PulseCheck.
+        """
+
+        return {"Subject": subject, "HtmlBody": html_body, "TextBody": text_body}
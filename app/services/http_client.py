@@ -0,0 +1,96 @@
+import logging
+from typing import Optional
+import httpx
+from app.core.config import settings
+from app.services.dns_cache import CachingNetworkBackend, dns_cache
+from app.services.probe import current_probe_timings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class ProbeClientManager:
+    """Process-wide httpx client shared by every probe path.
+
+    One connection pool per process lets the worker and manual checks reuse
+    keep-alive connections to the same hosts instead of paying TCP and TLS
+    setup on every probe. New connections are counted through httpcore trace
+    events so the reuse ratio can be checked in /metrics.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.http2 = settings.PROBE_HTTP2 and HTTP2_AVAILABLE
+
+        # Stats
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def _build_client(self) -> httpx.AsyncClient:
+        if settings.PROBE_HTTP2 and not HTTP2_AVAILABLE:
+            logger.warning("PROBE_HTTP2 is enabled but h2 is not installed, probing over HTTP/1.1")
+
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.PROBE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.PROBE_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.PROBE_KEEPALIVE_EXPIRY,
+            ),
+            http2=self.http2,
+        )
+        if settings.DNS_CACHE_ENABLED:
+            # httpx has no public option for the network backend, so set it on the pool
+            transport._pool._network_backend = CachingNetworkBackend(dns_cache)
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.PROBE_TIMEOUT, connect=settings.PROBE_CONNECT_TIMEOUT),
+            transport=transport,
+            event_hooks={"request": [self._on_request]},
+        )
+
+    async def _on_request(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+        timings = current_probe_timings.get()
+        if timings is not None:
+            timings.mark(event_name)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_stats(self) -> dict:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "connection_reuse_ratio": round(reused / self.requests, 3) if self.requests else None,
+            "dns_cache": dns_cache.get_stats(),
+        }
+
+
+# Global probe client instance
+probe_client = ProbeClientManager()
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Dict, Optional, Set
+from uuid import UUID
+from app.core.config import settings
+from app.core.database import redis_binary_client
+from app.schemas.monitor import LatencyPercentiles
+from app.services.sketch import LatencySketch
+
+logger = logging.getLogger(__name__)
+
+
+def latency_key(monitor_id: UUID, window: int) -> str:
+    return f"latency:{monitor_id}:{window}"
+
+
+class _MonitorWindows:
+    __slots__ = ("window", "current", "previous", "previous_unflushed")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.current = LatencySketch()
+        self.previous: Optional[LatencySketch] = None
+        self.previous_unflushed = False
+
+    def rotate(self, window: int, unflushed: bool):
+        adjacent = window == self.window + 1
+        self.previous = self.current if adjacent else None
+        self.previous_unflushed = unflushed and adjacent
+        self.current = LatencySketch()
+        self.window = window
+
+
+class LatencyTracker:
+    """Live latency sketches per monitor over the current and previous time window.
+
+    Each worker keeps two bounded sketches per monitor and periodically writes
+    them to Redis as one hash per monitor window, with a field per shard.
+    Readers merge every shard's field, so "latency right now" covers the last
+    one to two LATENCY_WINDOW_SECONDS across the whole cluster.
+    """
+
+    def __init__(self, window_seconds: int, flush_interval: float):
+        self.window_seconds = window_seconds
+        self.flush_interval = flush_interval
+        self.redis = redis_binary_client
+        self.shard_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._monitors: Dict[UUID, _MonitorWindows] = {}
+        self._dirty: Set[UUID] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def _window(self, at: Optional[float] = None) -> int:
+        return int((at if at is not None else time.time()) // self.window_seconds)
+
+    def add(self, monitor_id: UUID, latency_ms: Optional[int]):
+        """Record one probe latency for a monitor"""
+        if latency_ms is None:
+            return
+
+        window = self._window()
+        windows = self._monitors.get(monitor_id)
+        if windows is None:
+            windows = self._monitors[monitor_id] = _MonitorWindows(window)
+        elif windows.window != window:
+            windows.rotate(window, unflushed=monitor_id in self._dirty)
+
+        windows.current.add(latency_ms)
+        self._dirty.add(monitor_id)
+
+    def local_quantile(self, monitor_id: UUID, q: float, min_samples: int) -> Optional[float]:
+        """This worker's own estimate of a recent latency quantile, without a Redis read.
+
+        Returns None with fewer than `min_samples` samples in the current and
+        previous window.
+        """
+        windows = self._monitors.get(monitor_id)
+        if windows is None or self._window() - windows.window > 1:
+            return None
+
+        sketch = LatencySketch()
+        sketch.merge(windows.current)
+        if windows.previous is not None:
+            sketch.merge(windows.previous)
+        if sketch.count < min_samples:
+            return None
+        return sketch.quantile(q)
+
+    def forget(self, monitor_id: UUID):
+        self._monitors.pop(monitor_id, None)
+        self._dirty.discard(monitor_id)
+
+    async def flush(self):
+        """Write the sketches of monitors that changed since the last flush"""
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        ttl = 2 * self.window_seconds + int(self.flush_interval) + 1
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for monitor_id in dirty:
+                    windows = self._monitors.get(monitor_id)
+                    if windows is None:
+                        continue
+                    key = latency_key(monitor_id, windows.window)
+                    pipe.hset(key, self.shard_id, windows.current.to_bytes())
+                    pipe.expire(key, ttl)
+
+                    # Samples that landed just before the window rolled over
+                    if windows.previous_unflushed:
+                        key = latency_key(monitor_id, windows.window - 1)
+                        pipe.hset(key, self.shard_id, windows.previous.to_bytes())
+                        pipe.expire(key, ttl)
+                        windows.previous_unflushed = False
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to flush latency sketches: {e}")
+            self._dirty |= dirty
+
+    async def get_percentiles(self, monitor_id: UUID) -> LatencyPercentiles:
+        """Merge every shard's sketches for the current and previous window"""
+        window = self._window()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hvals(latency_key(monitor_id, window))
+            pipe.hvals(latency_key(monitor_id, window - 1))
+            current, previous = await pipe.execute()
+
+        sketch = LatencySketch()
+        for data in current + previous:
+            sketch.merge(LatencySketch.from_bytes(data))
+
+        def percentile(q: float) -> Optional[float]:
+            value = sketch.quantile(q)
+            return round(value, 1) if value is not None else None
+
+        return LatencyPercentiles(
+            monitor_id=monitor_id,
+            window_seconds=self.window_seconds,
+            samples=sketch.count,
+            p50_latency_ms=percentile(0.50),
+            p90_latency_ms=percentile(0.90),
+            p95_latency_ms=percentile(0.95),
+            p99_latency_ms=percentile(0.99),
+        )
+
+    async def start(self):
+        if self._task is None:
+            self.shard_id = f"{socket.gethostname()}:{os.getpid()}"
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def get_stats(self) -> dict:
+        return {
+            "tracked_monitors": len(self._monitors),
+            "pending_flush": len(self._dirty),
+        }
+
+
+# Global latency tracker instance
+latency_tracker = LatencyTracker(
+    window_seconds=settings.LATENCY_WINDOW_SECONDS,
+    flush_interval=settings.LATENCY_SKETCH_FLUSH_INTERVAL,
+)
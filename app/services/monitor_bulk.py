@@ -0,0 +1,239 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from uuid import UUID, uuid4
+from pydantic import ValidationError
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.monitor import Monitor, MonitorStatus
+from app.schemas.monitor import BulkItemResult, BulkMonitorUpdate, MonitorCreate, MonitorUpdate
+from app.services import status_cache
+from app.services.monitor_events import MONITOR_DELETED, MONITOR_UPSERTED, publish_monitor_changes
+
+
+class InvalidItem:
+    """Placeholder for a bulk input line that could not be parsed"""
+
+    def __init__(self, error: str):
+        self.error = error
+
+
+def _validation_detail(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+        for error in e.errors(include_url=False)
+    )
+
+
+def _parse(model, index: int, item: Any):
+    """Validate one bulk item, returning (model, None) or (None, error result)"""
+    if isinstance(item, InvalidItem):
+        return None, BulkItemResult(index=index, result="error", detail=item.error)
+    try:
+        return model.model_validate(item), None
+    except ValidationError as e:
+        return None, BulkItemResult(index=index, result="error", detail=_validation_detail(e))
+
+
+def _parse_ids(items: List[Any]) -> Tuple[List[Tuple[int, UUID]], List[BulkItemResult]]:
+    ids, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            ids.append((index, UUID(str(item))))
+        except ValueError:
+            detail = item.error if isinstance(item, InvalidItem) else "Expected a monitor id"
+            errors.append(BulkItemResult(index=index, result="error", detail=detail))
+    return ids, errors
+
+
+def monitor_update_values(monitor_data: MonitorUpdate) -> Dict[str, Any]:
+    """Column values for the fields set in an update; "" clears a body assertion"""
+    values: Dict[str, Any] = {}
+    if monitor_data.url is not None:
+        values["url"] = str(monitor_data.url)
+    if monitor_data.interval is not None:
+        values["interval"] = monitor_data.interval
+    if monitor_data.name is not None:
+        values["name"] = monitor_data.name
+    if monitor_data.is_active is not None:
+        values["is_active"] = monitor_data.is_active
+    if monitor_data.method is not None:
+        values["method"] = monitor_data.method
+    if monitor_data.max_body_bytes is not None:
+        values["max_body_bytes"] = monitor_data.max_body_bytes
+    if monitor_data.body_keyword is not None:
+        values["body_keyword"] = monitor_data.body_keyword or None
+        if values["body_keyword"]:
+            values["body_regex"] = None
+    if monitor_data.body_regex is not None:
+        values["body_regex"] = monitor_data.body_regex or None
+        if values["body_regex"]:
+            values["body_keyword"] = None
+    return values
+
+
+def has_invalid_assertion(method: str, body_keyword: str, body_regex: str) -> bool:
+    return method == "HEAD" and bool(body_keyword or body_regex)
+
+
+async def _announce(user_id: UUID, upserted: List[Monitor] = (), deleted_ids: List[UUID] = ()):
+    """Update the status cache and tell workers about the whole batch at once"""
+    await status_cache.monitors_changed(user_id, monitors=upserted, deleted_ids=deleted_ids)
+    await publish_monitor_changes(MONITOR_UPSERTED, [monitor.id for monitor in upserted])
+    await publish_monitor_changes(MONITOR_DELETED, deleted_ids)
+
+
+async def bulk_create(session: AsyncSession, user_id: UUID, items: List[Any]) -> List[BulkItemResult]:
+    """Insert every valid item with one batched INSERT"""
+    results, rows = [], []
+    now = datetime.utcnow()
+    for index, item in enumerate(items):
+        monitor_data, error = _parse(MonitorCreate, index, item)
+        if error:
+            results.append(error)
+            continue
+
+        row = {
+            "id": uuid4(),
+            "url": str(monitor_data.url),
+            "interval": monitor_data.interval,
+            "name": monitor_data.name,
+            "method": monitor_data.method,
+            "max_body_bytes": monitor_data.max_body_bytes,
+            "body_keyword": monitor_data.body_keyword or None,
+            "body_regex": monitor_data.body_regex or None,
+            "status": MonitorStatus.UNKNOWN,
+            "is_active": True,
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        rows.append(row)
+        results.append(BulkItemResult(index=index, id=row["id"], result="created"))
+
+    if rows:
+        await session.execute(insert(Monitor), rows)
+        await session.commit()
+        await _announce(user_id, upserted=[Monitor(**row) for row in rows])
+
+    return results
+
+
+async def bulk_update(session: AsyncSession, user_id: UUID, items: List[Any]) -> List[BulkItemResult]:
+    """Apply partial updates with one executemany UPDATE per distinct set of changed fields"""
+    results, updates = [], []
+    for index, item in enumerate(items):
+        monitor_data, error = _parse(BulkMonitorUpdate, index, item)
+        if error:
+            results.append(error)
+        else:
+            updates.append((index, monitor_data))
+
+    owned = {}
+    if updates:
+        result = await session.execute(
+            select(Monitor.id, Monitor.method, Monitor.body_keyword, Monitor.body_regex)
+            .where(Monitor.id.in_({monitor_data.id for _, monitor_data in updates}))
+            .where(Monitor.user_id == user_id)
+        )
+        owned = {row.id: row._asdict() for row in result}
+
+    # Items for the same monitor are merged in order, so each row is updated once
+    changes: Dict[UUID, Dict[str, Any]] = {}
+    for index, monitor_data in updates:
+        current = owned.get(monitor_data.id)
+        if current is None:
+            results.append(BulkItemResult(index=index, id=monitor_data.id, result="not_found"))
+            continue
+
+        values = monitor_update_values(monitor_data)
+        merged = {**current, **values}
+        if has_invalid_assertion(merged["method"], merged["body_keyword"], merged["body_regex"]):
+            results.append(BulkItemResult(
+                index=index, id=monitor_data.id, result="error", detail="Body assertions require the GET method"
+            ))
+            continue
+
+        # Later items for the same monitor see the earlier ones' changes
+        current.update(values)
+        changes.setdefault(monitor_data.id, {}).update(values)
+        results.append(BulkItemResult(index=index, id=monitor_data.id, result="updated"))
+
+    now = datetime.utcnow()
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+    for monitor_id, values in changes.items():
+        values["updated_at"] = now
+        groups[tuple(sorted(values))].append({"b_id": monitor_id, **{f"b_{k}": v for k, v in values.items()}})
+
+    table = Monitor.__table__
+    for fields, params in groups.items():
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values({field: bindparam(f"b_{field}") for field in fields})
+        )
+        await session.execute(stmt, params)
+
+    if groups:
+        await session.commit()
+        updated_ids = {result.id for result in results if result.result == "updated"}
+        result = await session.execute(select(Monitor).where(Monitor.id.in_(updated_ids)))
+        await _announce(user_id, upserted=list(result.scalars().all()))
+
+    return sorted(results, key=lambda result: result.index)
+
+
+async def bulk_set_active(
+        session: AsyncSession, user_id: UUID, items: List[Any], is_active: bool
+) -> List[BulkItemResult]:
+    """Pause or resume monitors with a single UPDATE ... RETURNING"""
+    ids, results = _parse_ids(items)
+    changed: Dict[UUID, Monitor] = {}
+    if ids:
+        result = await session.execute(
+            update(Monitor)
+            .where(Monitor.id.in_({monitor_id for _, monitor_id in ids}))
+            .where(Monitor.user_id == user_id)
+            .values(is_active=is_active, updated_at=datetime.utcnow())
+            .returning(Monitor)
+            .execution_options(synchronize_session=False)
+        )
+        changed = {monitor.id: monitor for monitor in result.scalars().all()}
+        await session.commit()
+
+    outcome = "resumed" if is_active else "paused"
+    results.extend(
+        BulkItemResult(index=index, id=monitor_id, result=outcome if monitor_id in changed else "not_found")
+        for index, monitor_id in ids
+    )
+
+    if changed:
+        await _announce(user_id, upserted=list(changed.values()))
+
+    return sorted(results, key=lambda result: result.index)
+
+
+async def bulk_delete(session: AsyncSession, user_id: UUID, items: List[Any]) -> List[BulkItemResult]:
+    """Delete monitors with a single DELETE ... RETURNING"""
+    ids, results = _parse_ids(items)
+    deleted = set()
+    if ids:
+        result = await session.execute(
+            delete(Monitor)
+            .where(Monitor.id.in_({monitor_id for _, monitor_id in ids}))
+            .where(Monitor.user_id == user_id)
+            .returning(Monitor.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = set(result.scalars().all())
+        await session.commit()
+
+    results.extend(
+        BulkItemResult(index=index, id=monitor_id, result="deleted" if monitor_id in deleted else "not_found")
+        for index, monitor_id in ids
+    )
+
+    if deleted:
+        await _announce(user_id, deleted_ids=list(deleted))
+
+    return sorted(results, key=lambda result: result.index)
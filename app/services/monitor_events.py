@@ -0,0 +1,45 @@
+import json
+import logging
+from typing import Iterable
+from uuid import UUID
+from app.core.database import redis_client
+from app.schemas.monitor import MonitorStatusUpdate
+
+logger = logging.getLogger(__name__)
+
+MONITOR_CHANGES_CHANNEL = "monitors:changes"
+
+MONITOR_UPSERTED = "upsert"
+MONITOR_DELETED = "delete"
+MONITOR_CHECKED = "checked"
+
+
+async def publish_monitor_changes(op: str, monitor_ids: Iterable[UUID]):
+    """Tell workers that monitors were created/updated ("upsert") or deleted ("delete")"""
+    ids = [str(monitor_id) for monitor_id in monitor_ids]
+    if not ids:
+        return
+
+    try:
+        await redis_client.publish(
+            MONITOR_CHANGES_CHANNEL,
+            json.dumps({"op": op, "monitor_ids": ids})
+        )
+    except Exception as e:
+        # Workers' periodic reconciliation picks the change up eventually
+        logger.error(f"Failed to publish monitor changes: {e}")
+
+
+async def publish_check_result(group_key: str, status_update: MonitorStatusUpdate):
+    """Hand a manual check's result to the worker that owns the monitor's probe group"""
+    try:
+        await redis_client.publish(
+            MONITOR_CHANGES_CHANNEL,
+            json.dumps({
+                "op": MONITOR_CHECKED,
+                "group_key": group_key,
+                "result": status_update.model_dump(mode="json"),
+            })
+        )
+    except Exception as e:
+        logger.error(f"Failed to publish check result for monitor {status_update.monitor_id}: {e}")
@@ -0,0 +1,124 @@
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Pattern
+
+PROBE_METHODS = ("GET", "HEAD")
+
+
+def _ms(start: Optional[float], end: Optional[float]) -> Optional[int]:
+    if start is None or end is None:
+        return None
+    return int((end - start) * 1000)
+
+
+@dataclass
+class PhaseTimings:
+    """Monotonic timestamps for one probe, filled in from httpcore trace events.
+
+    DNS, connect and TLS are only set when the probe opened a new connection;
+    a reused keep-alive connection goes straight to the request.
+    """
+
+    started: float = field(default_factory=time.monotonic)
+    dns_ms: Optional[int] = None
+    marks: Dict[str, float] = field(default_factory=dict)
+    finished: Optional[float] = None
+
+    def mark(self, event_name: str):
+        # Keep the first occurrence of each event
+        self.marks.setdefault(event_name, time.monotonic())
+
+    def finish(self):
+        self.finished = time.monotonic()
+
+    def _first(self, *names: str) -> Optional[float]:
+        for name in names:
+            if name in self.marks:
+                return self.marks[name]
+        return None
+
+    def as_dict(self) -> Dict[str, Optional[int]]:
+        connect_ms = _ms(
+            self.marks.get("connection.connect_tcp.started"),
+            self.marks.get("connection.connect_tcp.complete"),
+        )
+        if connect_ms is not None and self.dns_ms is not None:
+            # The caching network backend resolves inside connect_tcp
+            connect_ms = max(connect_ms - self.dns_ms, 0)
+
+        request_sent = self._first("http11.send_request_headers.started", "http2.send_request_headers.started")
+        headers_received = self._first(
+            "http11.receive_response_headers.complete", "http2.receive_response_headers.complete"
+        )
+        return {
+            "dns_ms": self.dns_ms,
+            "connect_ms": connect_ms,
+            "tls_ms": _ms(
+                self.marks.get("connection.start_tls.started"),
+                self.marks.get("connection.start_tls.complete"),
+            ),
+            "ttfb_ms": _ms(request_sent, headers_received),
+            "transfer_ms": _ms(headers_received, self.finished),
+        }
+
+
+# Timings of the probe running in the current task, if any
+current_probe_timings: ContextVar[Optional[PhaseTimings]] = ContextVar("current_probe_timings", default=None)
+
+
+@lru_cache(maxsize=1024)
+def compile_body_regex(pattern: str) -> Pattern[bytes]:
+    """Compile a monitor's body regex once per distinct pattern"""
+    return re.compile(pattern.encode())
+
+
+class BodyMatcher:
+    """Incremental keyword or regex search over a streamed response body.
+
+    Only a small tail of the previous chunk is kept between feeds so a match
+    that straddles a chunk boundary is still found: `len(keyword) - 1` bytes
+    for keywords, `regex_window` bytes for regexes.
+    """
+
+    def __init__(self, keyword: Optional[str] = None, regex: Optional[str] = None, regex_window: int = 4096):
+        if keyword:
+            self._keyword: Optional[bytes] = keyword.encode()
+            self._pattern: Optional[Pattern[bytes]] = None
+            self._overlap = len(self._keyword) - 1
+        else:
+            self._keyword = None
+            self._pattern = compile_body_regex(regex)
+            self._overlap = regex_window
+        self._tail = b""
+        self.matched = False
+
+    @classmethod
+    def for_monitor(cls, monitor, regex_window: int) -> Optional["BodyMatcher"]:
+        if monitor.body_keyword:
+            return cls(keyword=monitor.body_keyword)
+        if monitor.body_regex:
+            return cls(regex=monitor.body_regex, regex_window=regex_window)
+        return None
+
+    @property
+    def description(self) -> str:
+        if self._keyword is not None:
+            return f"keyword {self._keyword.decode()!r}"
+        return f"regex {self._pattern.pattern.decode()!r}"
+
+    def feed(self, chunk: bytes) -> bool:
+        """Search the next chunk, returning True once the assertion has matched"""
+        if self.matched:
+            return True
+
+        window = self._tail + chunk
+        if self._keyword is not None:
+            self.matched = self._keyword in window
+        else:
+            self.matched = self._pattern.search(window) is not None
+
+        self._tail = window[-self._overlap:] if self._overlap else b""
+        return self.matched
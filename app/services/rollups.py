@@ -0,0 +1,253 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import column, delete, select, tuple_, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.monitor import Monitor, MonitorStatus
+from app.models.monitor_rollup import MonitorRollup
+from app.schemas.monitor import MonitorStats, MonitorStatusUpdate
+from app.services.batching import BatchWriter
+from app.services.sketch import LatencySketch
+
+logger = logging.getLogger(__name__)
+
+# Resolution -> (bucket width, retention)
+ROLLUP_RESOLUTIONS = {
+    "1m": (timedelta(minutes=1), timedelta(days=1)),
+    "1h": (timedelta(hours=1), timedelta(days=8)),
+    "1d": (timedelta(days=1), timedelta(days=400)),
+}
+
+# Stats range -> (length, resolution answering it); every range reads at most ~170 rows
+STATS_RANGES = {
+    "1h": (timedelta(hours=1), "1m"),
+    "24h": (timedelta(hours=24), "1h"),
+    "7d": (timedelta(days=7), "1h"),
+    "30d": (timedelta(days=30), "1d"),
+    "90d": (timedelta(days=90), "1d"),
+    "365d": (timedelta(days=365), "1d"),
+}
+
+
+def bucket_start(checked_at: datetime, resolution: str) -> datetime:
+    """Floor a timestamp to the start of its rollup bucket"""
+    if resolution == "1m":
+        return checked_at.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return checked_at.replace(minute=0, second=0, microsecond=0)
+    return checked_at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class RollupAggregate:
+    check_count: int = 0
+    up_count: int = 0
+    latency_count: int = 0
+    latency_sum: int = 0
+    latency_min: Optional[int] = None
+    latency_max: Optional[int] = None
+    sketch: LatencySketch = field(default_factory=LatencySketch)
+
+    def add(self, status_update: MonitorStatusUpdate):
+        self.check_count += 1
+        if status_update.status == MonitorStatus.UP:
+            self.up_count += 1
+
+        latency = status_update.latency_ms
+        if latency is not None:
+            self.latency_count += 1
+            self.latency_sum += latency
+            self.latency_min = latency if self.latency_min is None else min(self.latency_min, latency)
+            self.latency_max = latency if self.latency_max is None else max(self.latency_max, latency)
+            self.sketch.add(latency)
+
+    def merge(self, other: "RollupAggregate"):
+        self.check_count += other.check_count
+        self.up_count += other.up_count
+        self.latency_count += other.latency_count
+        self.latency_sum += other.latency_sum
+        if other.latency_min is not None:
+            self.latency_min = other.latency_min if self.latency_min is None else min(self.latency_min, other.latency_min)
+        if other.latency_max is not None:
+            self.latency_max = other.latency_max if self.latency_max is None else max(self.latency_max, other.latency_max)
+        self.sketch.merge(other.sketch)
+
+    @classmethod
+    def from_row(cls, row) -> "RollupAggregate":
+        return cls(
+            check_count=row.check_count,
+            up_count=row.up_count,
+            latency_count=row.latency_count,
+            latency_sum=row.latency_sum,
+            latency_min=row.latency_min,
+            latency_max=row.latency_max,
+            sketch=LatencySketch.from_bytes(row.latency_sketch),
+        )
+
+
+RollupKey = Tuple[UUID, str, datetime]
+
+
+class RollupWriter(BatchWriter):
+    """Aggregates check results into 1m/1h/1d rollup deltas and merges them per flush.
+
+    A flush locks the existing rows for the touched buckets, merges the deltas
+    (including latency sketches) in memory and upserts them in one statement.
+    The upsert joins the monitor table, so deltas for a monitor deleted before
+    the flush are skipped instead of failing the batch on its foreign key.
+    """
+
+    name = "rollup"
+
+    def __init__(self, max_batch: int, flush_interval: float):
+        super().__init__(max_batch, flush_interval)
+        self._last_prune: Optional[datetime] = None
+
+    def _new_buffer(self) -> Dict[RollupKey, RollupAggregate]:
+        return {}
+
+    def _append(self, status_update: MonitorStatusUpdate):
+        for resolution in ROLLUP_RESOLUTIONS:
+            key = (status_update.monitor_id, resolution, bucket_start(status_update.checked_at, resolution))
+            aggregate = self._buffer.get(key)
+            if aggregate is None:
+                aggregate = self._buffer[key] = RollupAggregate()
+            aggregate.add(status_update)
+
+    def discard(self, monitor_id: UUID):
+        """Drop the buffered deltas of a deleted monitor"""
+        for key in [key for key in self._buffer if key[0] == monitor_id]:
+            del self._buffer[key]
+
+    def _requeue(self, batch):
+        for key, aggregate in batch.items():
+            pending = self._buffer.get(key)
+            if pending is None:
+                self._buffer[key] = aggregate
+            else:
+                pending.merge(aggregate)
+
+    async def _write(self, batch):
+        keys = list(batch.keys())
+        async with async_session() as session:
+            # Stay well under the driver's bind parameter limit
+            for i in range(0, len(keys), 1000):
+                await self._merge_chunk(session, {key: batch[key] for key in keys[i:i + 1000]})
+            await session.commit()
+
+        await self._prune()
+
+    async def _merge_chunk(self, session: AsyncSession, chunk: Dict[RollupKey, RollupAggregate]):
+        pk = tuple_(MonitorRollup.monitor_id, MonitorRollup.resolution, MonitorRollup.bucket_start)
+        result = await session.execute(
+            select(MonitorRollup.__table__).where(pk.in_(list(chunk.keys()))).with_for_update()
+        )
+        merged = {
+            (row.monitor_id, row.resolution, row.bucket_start): RollupAggregate.from_row(row)
+            for row in result
+        }
+        for key, delta in chunk.items():
+            if key in merged:
+                merged[key].merge(delta)
+            else:
+                merged[key] = delta
+
+        rows = [
+            (
+                monitor_id,
+                resolution,
+                start,
+                aggregate.check_count,
+                aggregate.up_count,
+                aggregate.latency_count,
+                aggregate.latency_sum,
+                aggregate.latency_min,
+                aggregate.latency_max,
+                aggregate.sketch.to_bytes(),
+            )
+            for (monitor_id, resolution, start), aggregate in merged.items()
+        ]
+
+        table = MonitorRollup.__table__
+        v = values(*(column(c.name, c.type) for c in table.columns), name="v").data(rows)
+        stmt = pg_insert(MonitorRollup).from_select(
+            [c.name for c in table.columns],
+            # Key share waits out a concurrent delete of the monitor, then skips it
+            select(v).join(Monitor, Monitor.id == v.c.monitor_id).with_for_update(of=Monitor, key_share=True),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["monitor_id", "resolution", "bucket_start"],
+            set_={
+                c.name: stmt.excluded[c.name]
+                for c in table.columns
+                if c.name not in ("monitor_id", "resolution", "bucket_start")
+            },
+        )
+        await session.execute(stmt)
+
+    async def _prune(self):
+        """Delete buckets past their resolution's retention, at most once an hour"""
+        now = datetime.utcnow()
+        if self._last_prune and now - self._last_prune < timedelta(hours=1):
+            return
+
+        try:
+            async with async_session() as session:
+                for resolution, (_, retention) in ROLLUP_RESOLUTIONS.items():
+                    await session.execute(
+                        delete(MonitorRollup)
+                        .where(MonitorRollup.resolution == resolution)
+                        .where(MonitorRollup.bucket_start < now - retention)
+                    )
+                await session.commit()
+            self._last_prune = now
+        except Exception as e:
+            logger.error(f"Failed to prune expired rollups: {e}")
+
+
+async def get_monitor_stats(session: AsyncSession, monitor_id: UUID, range_name: str) -> MonitorStats:
+    """Summarize a monitor's checks over a range from its precomputed rollups"""
+    length, resolution = STATS_RANGES[range_name]
+    since = bucket_start(datetime.utcnow() - length, resolution)
+
+    result = await session.execute(
+        select(MonitorRollup.__table__)
+        .where(MonitorRollup.monitor_id == monitor_id)
+        .where(MonitorRollup.resolution == resolution)
+        .where(MonitorRollup.bucket_start >= since)
+    )
+
+    total = RollupAggregate()
+    for row in result:
+        total.merge(RollupAggregate.from_row(row))
+
+    def percentile(q: float) -> Optional[float]:
+        value = total.sketch.quantile(q)
+        return round(value, 1) if value is not None else None
+
+    return MonitorStats(
+        monitor_id=monitor_id,
+        range=range_name,
+        resolution=resolution,
+        checks=total.check_count,
+        up_checks=total.up_count,
+        uptime_percentage=round(100 * total.up_count / total.check_count, 3) if total.check_count else None,
+        avg_latency_ms=round(total.latency_sum / total.latency_count, 1) if total.latency_count else None,
+        min_latency_ms=total.latency_min,
+        max_latency_ms=total.latency_max,
+        p50_latency_ms=percentile(0.50),
+        p95_latency_ms=percentile(0.95),
+        p99_latency_ms=percentile(0.99),
+    )
+
+
+# Global rollup writer instance
+rollup_writer = RollupWriter(
+    max_batch=settings.ROLLUP_FLUSH_MAX_BATCH,
+    flush_interval=settings.ROLLUP_FLUSH_INTERVAL,
+)
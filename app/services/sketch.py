@@ -0,0 +1,117 @@
+import math
+import struct
+import sys
+from array import array
+from typing import Optional
+
+
+class LatencySketch:
+    """Mergeable DDSketch-style quantile sketch for latencies in milliseconds.
+
+    Samples are counted in logarithmic buckets, so every quantile estimate is
+    within RELATIVE_ACCURACY of the true value. Buckets live in a dense array of
+    at most MAX_BINS counters; when the range of values outgrows it, the lowest
+    buckets are folded together, giving up accuracy on the fastest samples only.
+    """
+
+    RELATIVE_ACCURACY = 0.02
+    MAX_BINS = 256
+
+    _gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _log_gamma = math.log(_gamma)
+    _header = struct.Struct("<IiH")
+
+    __slots__ = ("zero_count", "offset", "bins")
+
+    def __init__(self):
+        self.zero_count = 0
+        self.offset = 0
+        self.bins = array("I")
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins)
+
+    def __bool__(self) -> bool:
+        return self.zero_count > 0 or any(self.bins)
+
+    @classmethod
+    def _key(cls, value: float) -> int:
+        return math.ceil(math.log(value) / cls._log_gamma)
+
+    @classmethod
+    def _value(cls, key: int) -> float:
+        return 2 * cls._gamma ** key / (cls._gamma + 1)
+
+    def _index(self, key: int) -> int:
+        """Grow the bin array to cover `key` and return its index"""
+        if not self.bins:
+            self.offset = key
+            self.bins.append(0)
+            return 0
+
+        top = self.offset + len(self.bins) - 1
+        if key < self.offset:
+            self.bins[0:0] = array("I", bytes(4 * (self.offset - key)))
+            self.offset = key
+        elif key > top:
+            self.bins.extend(array("I", bytes(4 * (key - top))))
+
+        excess = len(self.bins) - self.MAX_BINS
+        if excess > 0:
+            folded = sum(self.bins[:excess + 1])
+            del self.bins[:excess]
+            self.bins[0] = folded
+            self.offset += excess
+
+        return max(key, self.offset) - self.offset
+
+    def add(self, value: float, count: int = 1):
+        """Record `count` samples of `value`"""
+        if value <= 0:
+            self.zero_count += count
+            return
+        self.bins[self._index(self._key(value))] += count
+
+    def merge(self, other: "LatencySketch"):
+        """Fold another sketch's samples into this one"""
+        self.zero_count += other.zero_count
+        for i, count in enumerate(other.bins):
+            if count:
+                self.bins[self._index(other.offset + i)] += count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1), or None if the sketch is empty"""
+        total = self.count
+        if not total:
+            return None
+
+        rank = q * (total - 1)
+        cumulative = self.zero_count
+        if rank < cumulative:
+            return 0.0
+
+        for i, count in enumerate(self.bins):
+            cumulative += count
+            if cumulative > rank:
+                return self._value(self.offset + i)
+        return self._value(self.offset + len(self.bins) - 1)
+
+    def to_bytes(self) -> bytes:
+        bins = self.bins
+        if sys.byteorder != "little":
+            bins = array("I", bins)
+            bins.byteswap()
+        return self._header.pack(self.zero_count, self.offset, len(bins)) + bins.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "LatencySketch":
+        sketch = cls()
+        if not data:
+            return sketch
+
+        sketch.zero_count, sketch.offset, size = cls._header.unpack_from(data)
+        sketch.bins.frombytes(data[cls._header.size:cls._header.size + 4 * size])
+        if sys.byteorder != "little":
+            sketch.bins.byteswap()
+        return sketch
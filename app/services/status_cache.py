@@ -0,0 +1,232 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import redis_client
+from app.models.monitor import Monitor
+
+logger = logging.getLogger(__name__)
+
+# Configuration fields, written by the API; the worker only writes STATUS_FIELDS
+CONFIG_FIELDS = (
+    "id", "user_id", "url", "name", "interval", "method", "max_body_bytes",
+    "body_keyword", "body_regex", "is_active", "created_at", "updated_at",
+)
+STATUS_FIELDS = ("status", "last_latency_ms", "last_checked_at", "error_message")
+
+_INT_FIELDS = {"interval", "max_body_bytes", "last_latency_ms"}
+
+
+def monitor_cache_key(monitor_id: UUID) -> str:
+    return f"monitor_status:{monitor_id}"
+
+
+def user_monitors_key(user_id: UUID) -> str:
+    return f"user_monitors:{user_id}"
+
+
+def _encode(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return str(value)
+
+
+def _decode(data: Dict[str, str]) -> Optional[dict]:
+    """Turn a cached hash back into a MonitorResponse-shaped dict; None if it is incomplete"""
+    if not data.get("url"):
+        # Status written by the worker without the API's configuration (or after a delete)
+        return None
+
+    monitor = {}
+    for field, value in data.items():
+        if value == "":
+            monitor[field] = None
+        elif field in _INT_FIELDS:
+            monitor[field] = int(value)
+        elif field == "is_active":
+            monitor[field] = value == "1"
+        else:
+            monitor[field] = value
+    monitor.setdefault("status", "unknown")
+    for field in STATUS_FIELDS:
+        monitor.setdefault(field, None)
+    return monitor
+
+
+def status_mapping(status: str, latency_ms: Optional[int], checked_at, error_message: Optional[str]) -> Dict[str, str]:
+    return {
+        "status": status,
+        "last_latency_ms": _encode(latency_ms),
+        "last_checked_at": _encode(checked_at),
+        "error_message": _encode(error_message),
+    }
+
+
+def _config_mapping(monitor: Monitor) -> Dict[str, str]:
+    return {field: _encode(getattr(monitor, field)) for field in CONFIG_FIELDS}
+
+
+def _status_mapping_of(monitor: Monitor) -> Dict[str, str]:
+    return status_mapping(_encode(monitor.status), monitor.last_latency_ms, monitor.last_checked_at, None)
+
+
+def _from_model(monitor: Monitor) -> dict:
+    return _decode(_config_mapping(monitor) | _status_mapping_of(monitor))
+
+
+def _queue_backfill(pipe, monitor: Monitor):
+    """Cache a monitor read from the database without overwriting newer status from the worker"""
+    key = monitor_cache_key(monitor.id)
+    pipe.hset(key, mapping=_config_mapping(monitor))
+    for field, value in _status_mapping_of(monitor).items():
+        pipe.hsetnx(key, field, value)
+    pipe.expire(key, settings.STATUS_CACHE_TTL_SECONDS)
+
+
+async def cache_monitors(monitors: Iterable[Monitor], user_id: Optional[UUID] = None):
+    """Backfill monitors read from the database, and optionally the user's full id set"""
+    monitors = list(monitors)
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for monitor in monitors:
+                _queue_backfill(pipe, monitor)
+            if user_id is not None:
+                key = user_monitors_key(user_id)
+                pipe.delete(key)
+                # An empty set can't be stored, so a user without monitors stays a miss
+                if monitors:
+                    pipe.sadd(key, *(str(monitor.id) for monitor in monitors))
+                    # Kept short: a list read racing a create can store a set missing the new monitor
+                    pipe.expire(key, settings.USER_MONITORS_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to cache monitors: {e}")
+
+
+async def monitor_changed(monitor: Monitor, deleted: bool = False):
+    """Refresh a monitor's cached configuration after an API write"""
+    if deleted:
+        await monitors_changed(monitor.user_id, deleted_ids=[monitor.id])
+    else:
+        await monitors_changed(monitor.user_id, monitors=[monitor])
+
+
+async def monitors_changed(user_id: UUID, monitors: Iterable[Monitor] = (), deleted_ids: Iterable[UUID] = ()):
+    """Refresh cached configuration for written monitors and drop deleted ones in one pipeline.
+
+    The owner's id set is dropped rather than edited, so it is rebuilt from
+    the database on the next list read.
+    """
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.delete(user_monitors_key(user_id))
+            for monitor_id in deleted_ids:
+                pipe.delete(monitor_cache_key(monitor_id))
+            for monitor in monitors:
+                _queue_backfill(pipe, monitor)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to update cached monitors for user {user_id}: {e}")
+
+
+async def get_cached_monitors(monitor_ids: List[UUID]) -> Dict[UUID, dict]:
+    """Cached monitors by id; missing or incomplete entries are left out"""
+    if not monitor_ids:
+        return {}
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for monitor_id in monitor_ids:
+                pipe.hgetall(monitor_cache_key(monitor_id))
+            results = await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to read cached monitors: {e}")
+        return {}
+
+    cached = {}
+    for monitor_id, data in zip(monitor_ids, results):
+        monitor = _decode(data) if data else None
+        if monitor is not None:
+            cached[monitor_id] = monitor
+    return cached
+
+
+async def get_cached_statuses(monitor_ids: List[UUID]) -> Dict[UUID, dict]:
+    """Latest cached status fields by monitor id, for overlaying on database rows"""
+    if not monitor_ids:
+        return {}
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for monitor_id in monitor_ids:
+                pipe.hmget(monitor_cache_key(monitor_id), *STATUS_FIELDS)
+            results = await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to read cached statuses: {e}")
+        return {}
+
+    statuses = {}
+    for monitor_id, values in zip(monitor_ids, results):
+        if values[0]:
+            statuses[monitor_id] = {
+                field: int(value) if value and field in _INT_FIELDS else (value or None)
+                for field, value in zip(STATUS_FIELDS, values)
+            }
+    return statuses
+
+
+async def get_monitors(session: AsyncSession, monitor_ids: List[UUID], user_id: Optional[UUID] = None) -> List[dict]:
+    """Monitors among `monitor_ids`, from the cache with a database fallback for misses.
+
+    With a user id, only that user's monitors are returned.
+    """
+    cached = await get_cached_monitors(monitor_ids)
+    monitors = [
+        monitor for monitor in cached.values()
+        if user_id is None or monitor["user_id"] == str(user_id)
+    ]
+
+    missing = [monitor_id for monitor_id in monitor_ids if monitor_id not in cached]
+    if missing:
+        query = select(Monitor).where(Monitor.id.in_(missing))
+        if user_id is not None:
+            query = query.where(Monitor.user_id == user_id)
+        result = await session.execute(query)
+        loaded = result.scalars().all()
+        await cache_monitors(loaded)
+        monitors.extend(_from_model(monitor) for monitor in loaded)
+
+    return monitors
+
+
+async def get_monitor(session: AsyncSession, monitor_id: UUID, user_id: Optional[UUID] = None) -> Optional[dict]:
+    monitors = await get_monitors(session, [monitor_id], user_id)
+    return monitors[0] if monitors else None
+
+
+async def get_user_monitors(session: AsyncSession, user_id: UUID) -> List[dict]:
+    """All of a user's monitors, newest first, served from the cache when it is warm"""
+    try:
+        member_ids = await redis_client.smembers(user_monitors_key(user_id))
+    except Exception as e:
+        logger.error(f"Failed to read cached monitor ids for user {user_id}: {e}")
+        member_ids = None
+
+    if member_ids:
+        monitors = await get_monitors(session, [UUID(monitor_id) for monitor_id in member_ids], user_id)
+    else:
+        result = await session.execute(select(Monitor).where(Monitor.user_id == user_id))
+        loaded = result.scalars().all()
+        await cache_monitors(loaded, user_id=user_id)
+        cached = await get_cached_monitors([monitor.id for monitor in loaded])
+        monitors = [cached.get(monitor.id) or _from_model(monitor) for monitor in loaded]
+
+    return sorted(monitors, key=lambda monitor: monitor["created_at"] or "", reverse=True)
@@ -0,0 +1,90 @@
+import logging
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from app.core.config import settings
+from app.core.database import redis_client
+from app.services.status_cache import monitor_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Appends the event to the monitor's capped stream, updates its hot status
+# hash and publishes it with the stream id spliced into the JSON object, so
+# live and replayed events carry the same id.
+# KEYS: stream, channel, status hash.
+# ARGV: maxlen, stream ttl ms, payload, hash ttl s, then status field/value pairs.
+PUBLISH_STATUS_EVENT_SCRIPT = """
+local event_id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[3])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+redis.call('HSET', KEYS[3], 'event_id', event_id, unpack(ARGV, 5))
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+redis.call('PUBLISH', KEYS[2], string.sub(ARGV[3], 1, -2) .. ',"event_id":"' .. event_id .. '"}')
+return event_id
+"""
+
+_publish_script = redis_client.register_script(PUBLISH_STATUS_EVENT_SCRIPT)
+
+
+def status_channel(monitor_id: UUID) -> str:
+    return f"monitor:{monitor_id}"
+
+
+def status_stream_key(monitor_id: UUID) -> str:
+    return f"monitor_events:{monitor_id}"
+
+
+def with_event_id(payload: str, event_id: str) -> str:
+    """Add an event id to a serialized JSON object the same way the publish script does"""
+    return f'{payload[:-1]},"event_id":"{event_id}"}}'
+
+
+def _parse_event_id(event_id: str) -> Tuple[int, int]:
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+async def publish_status_event(monitor_id: UUID, payload: str, status: Dict[str, str]) -> Optional[str]:
+    """Record a serialized status update in the monitor's stream and status cache, and publish it.
+
+    Returns the stream event id, or None if Redis could not be reached.
+    """
+    try:
+        return await _publish_script(
+            keys=[status_stream_key(monitor_id), status_channel(monitor_id), monitor_cache_key(monitor_id)],
+            args=[
+                settings.STATUS_STREAM_MAXLEN,
+                settings.STATUS_STREAM_TTL_SECONDS * 1000,
+                payload,
+                settings.STATUS_CACHE_TTL_SECONDS,
+                *chain.from_iterable(status.items()),
+            ],
+        )
+    except Exception as e:
+        logger.error(f"Failed to publish status update: {e}")
+        return None
+
+
+async def read_events_since(monitor_id: UUID, last_event_id: str) -> Optional[List[str]]:
+    """Events recorded after `last_event_id`, each with its event id included.
+
+    Returns None when the gap can't be replayed: the id is malformed, older
+    events were already trimmed from the stream, or the gap is longer than
+    STATUS_STREAM_RESUME_LIMIT. Callers then fall back to a full snapshot.
+    """
+    try:
+        last = _parse_event_id(last_event_id)
+    except ValueError:
+        return None
+
+    key = status_stream_key(monitor_id)
+    limit = settings.STATUS_STREAM_RESUME_LIMIT
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.xrange(key, "-", "+", count=1)
+        pipe.xrange(key, f"({last_event_id}", "+", count=limit + 1)
+        oldest, events = await pipe.execute()
+
+    # The stream must still reach back to the client's last event
+    if not oldest or _parse_event_id(oldest[0][0]) > last or len(events) > limit:
+        return None
+
+    return [with_event_id(fields["data"], event_id) for event_id, fields in events]
@@ -0,0 +1,73 @@
+from typing import Dict
+from uuid import UUID
+from sqlalchemy import DateTime, Integer, cast, column, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.monitor import Monitor
+from app.schemas.monitor import MonitorStatusUpdate
+from app.services.batching import BatchWriter
+
+
+class StatusWriter(BatchWriter):
+    """Persists monitor status updates as one UPDATE ... FROM (VALUES ...) per flush.
+
+    Only the latest update per monitor is kept between flushes. `updated_at`
+    is left alone: it tracks configuration changes, which the worker registry
+    relies on for reconciliation.
+    """
+
+    name = "status"
+
+    def _new_buffer(self) -> Dict[UUID, MonitorStatusUpdate]:
+        return {}
+
+    def _append(self, status_update: MonitorStatusUpdate):
+        self._buffer[status_update.monitor_id] = status_update
+
+    def _requeue(self, batch):
+        # Keep failed rows unless a newer update arrived in the meantime
+        for monitor_id, status_update in batch.items():
+            self._buffer.setdefault(monitor_id, status_update)
+
+    async def _write(self, batch):
+        rows = [
+            (
+                status_update.monitor_id,
+                status_update.status,
+                status_update.latency_ms,
+                status_update.checked_at,
+            )
+            for status_update in batch.values()
+        ]
+
+        v = values(
+            column("id", PGUUID(as_uuid=True)),
+            column("status", Monitor.__table__.c.status.type),
+            column("latency_ms", Integer),
+            column("checked_at", DateTime),
+            name="v",
+        ).data(rows)
+
+        # The cast keeps an all-NULL column from being typed as text by Postgres
+        stmt = (
+            update(Monitor)
+            .where(Monitor.id == v.c.id)
+            .values(
+                status=v.c.status,
+                last_latency_ms=cast(v.c.latency_ms, Integer),
+                last_checked_at=v.c.checked_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        async with async_session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+
+# Global status writer instance
+status_writer = StatusWriter(
+    max_batch=settings.STATUS_FLUSH_MAX_BATCH,
+    flush_interval=settings.STATUS_FLUSH_INTERVAL,
+)
@@ -1,16 +1,23 @@
 import asyncio
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 import httpx
 import redis.asyncio as redis
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.core.database import async_session, redis_client
+from app.core.database import redis_client
 from app.models.monitor import Monitor, MonitorStatus
 from app.schemas.monitor import MonitorStatusUpdate
-from app.services.email import EmailService
+from app.services.alert_digest import alert_coalescer
+from app.services.check_history import check_history_writer
+from app.services.email import ALERT_DOWN, ALERT_UP, AlertEvent
+from app.services.http_client import probe_client
+from app.services.latency import latency_tracker
+from app.services.probe import BodyMatcher, PhaseTimings, current_probe_timings
+from app.services.rollups import rollup_writer
+from app.services.status_cache import status_mapping
+from app.services.status_stream import publish_status_event
+from app.services.status_writer import status_writer
 import json
 import logging
 
@@ -20,116 +27,173 @@ logger = logging.getLogger(__name__)
 class UptimeService:
     def __init__(self):
         self.redis = redis_client
-        self.email_service = EmailService()
-        self.http_client = httpx.AsyncClient(timeout=30.0)
 
-    async def check_monitor(self, monitor: Monitor) -> MonitorStatusUpdate:
-        """Check a single monitor's status"""
-        start_time = time.time()
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        return probe_client.client
+
+    def probe_timeout(self, monitor: Monitor, adaptive: bool = True) -> httpx.Timeout:
+        """Connect and read timeouts scaled to the monitor's recent p99 latency.
+
+        Clamped between the PROBE_*_FLOOR settings and the client defaults, so
+        a hung target frees its probe slot in seconds. Falls back to the
+        defaults until the worker has enough recent samples.
+        """
+        p99_ms = None
+        if adaptive:
+            p99_ms = latency_tracker.local_quantile(monitor.id, 0.99, settings.PROBE_ADAPTIVE_MIN_SAMPLES)
+        if p99_ms is None:
+            return httpx.Timeout(settings.PROBE_TIMEOUT, connect=settings.PROBE_CONNECT_TIMEOUT)
+
+        budget = p99_ms / 1000 * settings.PROBE_TIMEOUT_P99_MULTIPLIER
+        return httpx.Timeout(
+            min(max(budget, settings.PROBE_TIMEOUT_FLOOR), settings.PROBE_TIMEOUT),
+            connect=min(max(budget, settings.PROBE_CONNECT_TIMEOUT_FLOOR), settings.PROBE_CONNECT_TIMEOUT),
+            # Waiting for a pooled connection says nothing about the target
+            pool=settings.PROBE_TIMEOUT,
+        )
+
+    async def check_monitor(self, monitor: Monitor, adaptive_timeout: bool = True) -> MonitorStatusUpdate:
+        """Check a single monitor's status.
+
+        The body is streamed and only read when the monitor has a content
+        assertion, up to its byte cap; otherwise the connection is closed once
+        the status line and headers are in. Phase timings are collected from
+        the probe client's trace events.
+        """
+        timeout = self.probe_timeout(monitor, adaptive_timeout)
+        timings = PhaseTimings()
+        token = current_probe_timings.set(timings)
         status = MonitorStatus.DOWN
         latency_ms = None
         error_message = None
 
         try:
-            response = await self.http_client.get(monitor.url)
-            latency_ms = int((time.time() - start_time) * 1000)
-
-            if 200 <= response.status_code < 400:
-                status = MonitorStatus.UP
-            else:
-                status = MonitorStatus.DOWN
-                error_message = f"HTTP {response.status_code}"
-
+            async with self.http_client.stream(monitor.method or "GET", monitor.url, timeout=timeout) as response:
+                latency_ms = int((time.monotonic() - timings.started) * 1000)
+
+                if 200 <= response.status_code < 400:
+                    status = MonitorStatus.UP
+                    error_message = await self._check_body(monitor, response)
+                    if error_message:
+                        status = MonitorStatus.DOWN
+                else:
+                    status = MonitorStatus.DOWN
+                    error_message = f"HTTP {response.status_code}"
+
+                timings.finish()
+
+        except httpx.ConnectTimeout:
+            error_message = f"Connect timeout after {timeout.connect:g}s"
+            status = MonitorStatus.DOWN
         except httpx.TimeoutException:
-            error_message = "Request timeout"
+            error_message = f"Request timeout after {timeout.read:g}s"
             status = MonitorStatus.DOWN
         except Exception as e:
             error_message = str(e)
             status = MonitorStatus.DOWN
+        finally:
+            current_probe_timings.reset(token)
 
         return MonitorStatusUpdate(
             monitor_id=monitor.id,
             status=status,
             latency_ms=latency_ms,
             checked_at=datetime.utcnow(),
-            error_message=error_message
+            error_message=error_message,
+            **timings.as_dict()
         )
 
-    async def update_monitor_status(self, session: AsyncSession, status_update: MonitorStatusUpdate):
-        """Update monitor status in database"""
-        result = await session.execute(
-            select(Monitor).where(Monitor.id == status_update.monitor_id)
-        )
-        monitor = result.scalar_one_or_none()
+    async def _check_body(self, monitor: Monitor, response: httpx.Response) -> Optional[str]:
+        """Evaluate the monitor's content assertion, reading no more than its byte cap.
+
+        Returns an error message if the assertion did not match.
+        """
+        matcher = BodyMatcher.for_monitor(monitor, settings.PROBE_REGEX_WINDOW_BYTES)
+        if matcher is None or monitor.method == "HEAD":
+            await self._drain_small_body(response)
+            return None
+
+        max_bytes = monitor.max_body_bytes or settings.PROBE_MAX_BODY_BYTES
+        bytes_read = 0
+        async for chunk in response.aiter_bytes():
+            chunk = chunk[:max_bytes - bytes_read]
+            bytes_read += len(chunk)
+            if matcher.feed(chunk):
+                return None
+            if bytes_read >= max_bytes:
+                return f"Body {matcher.description} not found in first {max_bytes} bytes"
+
+        return f"Body {matcher.description} not found"
+
+    async def _drain_small_body(self, response: httpx.Response):
+        """Read short bodies to the end so the connection can go back to the pool.
+
+        An unread response forces the connection closed, which costs a new
+        TCP and TLS handshake on the next probe to the same host.
+        """
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) <= settings.PROBE_KEEPALIVE_DRAIN_BYTES:
+            await response.aread()
+
+    async def record_status(self, monitor: Monitor, status_update: MonitorStatusUpdate):
+        """Apply a check result to an in-memory monitor and queue it for the batched writers"""
+        await self._apply_status(monitor, status_update)
+        status_writer.add(status_update)
+        check_history_writer.add(status_update)
+        rollup_writer.add(status_update)
+        latency_tracker.add(status_update.monitor_id, status_update.latency_ms)
 
-        if not monitor:
-            return
+        # Publish to Redis for WebSocket
+        await self._publish_status_update(status_update)
 
+    async def _apply_status(self, monitor: Monitor, status_update: MonitorStatusUpdate):
+        """Copy a check result onto the monitor, alerting on DOWN and UP transitions.
+
+        The alert decision uses the status the monitor holds in memory, so no
+        fresh read is needed. Debouncing and per-user digests are handled by
+        the alert coalescer.
+        """
         old_status = monitor.status
         monitor.status = status_update.status
         monitor.last_latency_ms = status_update.latency_ms
         monitor.last_checked_at = status_update.checked_at
-        monitor.updated_at = datetime.utcnow()
-
-        session.add(monitor)
-        await session.commit()
 
         # Check if we need to send alert
         if old_status != MonitorStatus.DOWN and status_update.status == MonitorStatus.DOWN:
-            await self._check_and_send_alert(session, monitor, status_update.error_message)
-
-        # Publish to Redis for WebSocket
-        await self._publish_status_update(status_update)
-
-    async def _check_and_send_alert(self, session: AsyncSession, monitor: Monitor, error_message: Optional[str]):
-        """Send email alert if conditions are met"""
-        now = datetime.utcnow()
-
-        # Check debounce period
-        if monitor.last_alert_sent_at:
-            time_since_last_alert = now - monitor.last_alert_sent_at
-            if time_since_last_alert < timedelta(minutes=settings.EMAIL_DEBOUNCE_MINUTES):
-                return
-
-        # Send alert
-        await self.email_service.send_down_alert(monitor, error_message)
+            kind = ALERT_DOWN
+        elif old_status == MonitorStatus.DOWN and status_update.status == MonitorStatus.UP:
+            kind = ALERT_UP
+        else:
+            return
 
-        # Update last alert time
-        monitor.last_alert_sent_at = now
-        session.add(monitor)
-        await session.commit()
+        await alert_coalescer.add(AlertEvent.from_monitor(
+            monitor, kind, status_update.checked_at, status_update.latency_ms, status_update.error_message
+        ))
 
     async def _publish_status_update(self, status_update: MonitorStatusUpdate):
-        """Publish status update to Redis for WebSocket broadcasting"""
-        try:
-            await self.redis.publish(
-                f"monitor:{status_update.monitor_id}",
-                json.dumps({
-                    "monitor_id": str(status_update.monitor_id),
-                    "status": status_update.status.value,
-                    "latency_ms": status_update.latency_ms,
-                    "checked_at": status_update.checked_at.isoformat(),
-                    "error_message": status_update.error_message
-                })
-            )
-        except Exception as e:
-            logger.error(f"Failed to publish status update: {e}")
-
-    async def get_active_monitors(self) -> list[Monitor]:
-        """Get all active monitors that need checking"""
-        async with async_session() as session:
-            result = await session.execute(
-                select(Monitor).where(Monitor.is_active == True)
-            )
-            return result.scalars().all()
-
-    async def should_check_monitor(self, monitor: Monitor) -> bool:
-        """Check if monitor should be checked based on interval"""
+        """Record the status update in the monitor's event stream and status cache, and publish it"""
+        await publish_status_event(
+            status_update.monitor_id,
+            json.dumps({
+                "monitor_id": str(status_update.monitor_id),
+                "status": status_update.status.value,
+                "latency_ms": status_update.latency_ms,
+                "checked_at": status_update.checked_at.isoformat(),
+                "error_message": status_update.error_message
+            }),
+            status_mapping(
+                status_update.status.value,
+                status_update.latency_ms,
+                status_update.checked_at,
+                status_update.error_message,
+            ),
+        )
+
+    def seconds_until_due(self, monitor: Monitor) -> float:
+        """Seconds until the monitor's next check is due based on interval"""
         if not monitor.last_checked_at:
-            return True
+            return 0.0
 
         time_since_check = datetime.utcnow() - monitor.last_checked_at
-        return time_since_check.total_seconds() >= monitor.interval
-
-    async def close(self):
-        await self.http_client.aclose()
\ No newline at end of file
+        return max(0.0, monitor.interval - time_since_check.total_seconds())
\ No newline at end of file
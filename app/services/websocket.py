@@ -1,29 +1,275 @@
 import asyncio
 import json
 import logging
-from typing import Dict, Set
+from typing import Dict, Hashable, Iterable, List, Optional, Set
 from uuid import UUID
 from fastapi import WebSocket
 import redis.asyncio as redis
+from app.core.config import settings
 from app.core.database import redis_client
+from app.services.status_stream import status_channel
 
 logger = logging.getLogger(__name__)
 
+# Sent in place of a dropped backlog; clients should re-read current status
+RESYNC_MESSAGE = json.dumps({"type": "resync"})
+
+# Coalesced updates are sent as {"type": "batch", "updates": [<update>, ...]}
+BATCH_PREFIX = '{"type": "batch", "updates": ['
+BATCH_SUFFIX = "]}"
+
+# Socket closes still in flight; referenced so they aren't collected before running
+_closing: Set[asyncio.Task] = set()
+
+
+class ClientConnection:
+    """One WebSocket with a bounded outbound queue drained by its own writer task.
+
+    Producers only enqueue, so a client that stops reading never blocks
+    delivery to anyone else. When the queue is full the client is either sent
+    a resync marker in place of the backlog or disconnected, depending on
+    WS_SLOW_CONSUMER_POLICY.
+
+    With a coalescing window, status updates skip the queue: they collapse
+    into a pending dict holding the latest payload per monitor, which the
+    writer sends as one batch frame per window. The dict is bounded by the
+    client's subscriptions, so an outage flipping many monitors at once can't
+    overflow the queue. Payloads are the already-serialized strings shared by
+    every recipient; the batch frame is assembled by joining them, never by
+    re-encoding.
+    """
+
+    def __init__(
+            self,
+            websocket: WebSocket,
+            queue_size: int,
+            send_timeout: float,
+            policy: str,
+            coalesce_window: float = 0.0,
+    ):
+        self.websocket = websocket
+        self.monitor_ids: Set[UUID] = set()
+        self.send_timeout = send_timeout
+        self.policy = policy
+        self.coalesce_window = coalesce_window
+        self.closed = False
+        # Direct messages, plus pending updates moved ahead of them to keep ordering
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._pending: Dict[Hashable, str] = {}
+        self._wake = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._writer())
+
+        # Stats
+        self.sent = 0
+        self.dropped = 0
+        self.resyncs = 0
+        self.batches = 0
+        self.evicted = False
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() + len(self._pending)
+
+    def enqueue(self, message: str, key: Optional[Hashable] = None) -> bool:
+        """Queue a message without waiting; returns False if the client was evicted.
+
+        Messages with a key are status updates that may be coalesced, keeping
+        only the latest per key; messages without one are always sent as is.
+        """
+        if self.closed:
+            return False
+
+        if key is not None and self.coalesce_window > 0:
+            # Re-inserting keeps the dict ordered by each monitor's latest update
+            self._pending.pop(key, None)
+            self._pending[key] = message
+            self._wake.set()
+            return True
+
+        backlog = self.queue_depth
+        items: List = [message]
+        if self._pending:
+            # Updates that arrived before this message go out before it
+            items.insert(0, self._pending)
+            self._pending = {}
+        try:
+            for item in items:
+                self._queue.put_nowait(item)
+            self._wake.set()
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        self.dropped += backlog
+        if self.policy == "resync":
+            # The backlog is stale anyway; tell the client to re-read current state
+            self._clear()
+            self._queue.put_nowait(RESYNC_MESSAGE)
+            self._wake.set()
+            self.resyncs += 1
+            return True
+
+        logger.warning("Evicting slow WebSocket consumer with a full send queue")
+        self.evicted = True
+        self._clear()
+        self.close(code=1013, reason="Send queue overflow")
+        return False
+
+    def _clear(self):
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._pending = {}
+
+    async def _send(self, message: str):
+        await asyncio.wait_for(self.websocket.send_text(message), self.send_timeout)
+        self.sent += 1
+
+    async def _send_updates(self, updates: Dict[Hashable, str]):
+        if len(updates) == 1:
+            await self._send(next(iter(updates.values())))
+        elif updates:
+            await self._send(BATCH_PREFIX + ",".join(updates.values()) + BATCH_SUFFIX)
+            self.batches += 1
+
+    async def _drain_queue(self):
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if isinstance(item, dict):
+                await self._send_updates(item)
+            else:
+                await self._send(item)
+
+    async def _writer(self):
+        try:
+            while True:
+                await self._wake.wait()
+                self._wake.clear()
+                await self._drain_queue()
+                if not self._pending:
+                    continue
+
+                # Let the window fill, then send the latest update per monitor
+                await asyncio.sleep(self.coalesce_window)
+                await self._drain_queue()
+                updates, self._pending = self._pending, {}
+                await self._send_updates(updates)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Closing WebSocket after failed send: {type(e).__name__}: {e}")
+            self.closed = True
+            try:
+                await self.websocket.close(code=1011)
+            except Exception:
+                pass
+
+    def close(self, code: int = 1000, reason: str = ""):
+        """Stop the writer and close the socket; the endpoint's receive loop then exits"""
+        if self.closed:
+            return
+        self.closed = True
+        self._writer_task.cancel()
+        task = asyncio.create_task(self._close_socket(code, reason))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+    async def _close_socket(self, code: int, reason: str):
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    async def aclose(self):
+        self.closed = True
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except (asyncio.CancelledError, Exception):
+            pass
+
 
 class WebSocketManager:
     def __init__(self):
-        self.active_connections: Dict[UUID, Set[WebSocket]] = {}
+        self.active_connections: Dict[UUID, Set[ClientConnection]] = {}
+        self.clients: Dict[WebSocket, ClientConnection] = {}
         self.redis = redis_client
         self._subscriber_task = None
         self._shutdown = False
 
-    async def connect(self, websocket: WebSocket, monitor_id: UUID):
+        # Redis channels follow the monitors with local viewers; changes are
+        # collected here and applied in batches by the subscriber loop
+        self._subscribed_channels: Set[UUID] = set()
+        self._pending_channels: Set[UUID] = set()
+        self._channels_changed = asyncio.Event()
+        self.channel_changes = 0
+
+        # Stats of connections that have gone away
+        self._retired_stats = {"sent": 0, "dropped": 0, "resyncs": 0, "batches": 0, "evictions": 0}
+
+    def register(self, websocket: WebSocket) -> ClientConnection:
+        """Set up the send queue and writer for a WebSocket"""
+        client = self.clients.get(websocket)
+        if client is None:
+            client = ClientConnection(
+                websocket,
+                queue_size=settings.WS_SEND_QUEUE_SIZE,
+                send_timeout=settings.WS_SEND_TIMEOUT,
+                policy=settings.WS_SLOW_CONSUMER_POLICY,
+                coalesce_window=settings.WS_COALESCE_WINDOW_MS / 1000,
+            )
+            self.clients[websocket] = client
+        return client
+
+    def unregister(self, websocket: WebSocket):
+        """Drop all of a WebSocket's subscriptions and stop its writer"""
+        client = self.clients.get(websocket)
+        if client is not None:
+            self._forget(client)
+            client.close()
+
+    def subscribe(self, websocket: WebSocket, monitor_ids: Iterable[UUID]):
+        """Deliver updates for these monitors to the WebSocket"""
+        client = self.register(websocket)
+        for monitor_id in monitor_ids:
+            client.monitor_ids.add(monitor_id)
+            self._add_subscriber(monitor_id, client)
+        self._ensure_subscriber()
+
+    def unsubscribe(self, websocket: WebSocket, monitor_ids: Iterable[UUID]):
+        """Stop delivering updates for these monitors to the WebSocket"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return
 
-        if monitor_id not in self.active_connections:
-            self.active_connections[monitor_id] = set()
+        for monitor_id in monitor_ids:
+            client.monitor_ids.discard(monitor_id)
+            self._remove_subscriber(monitor_id, client)
+
+    def _add_subscriber(self, monitor_id: UUID, client: ClientConnection):
+        subscribers = self.active_connections.get(monitor_id)
+        if subscribers is None:
+            subscribers = self.active_connections[monitor_id] = set()
+            self._mark_channel(monitor_id)
+        subscribers.add(client)
+
+    def _remove_subscriber(self, monitor_id: UUID, client: ClientConnection):
+        subscribers = self.active_connections.get(monitor_id)
+        if subscribers is None:
+            return
+
+        subscribers.discard(client)
+
+        # Clean up empty sets
+        if not subscribers:
+            del self.active_connections[monitor_id]
+            self._mark_channel(monitor_id)
 
-        self.active_connections[monitor_id].add(websocket)
+    def _mark_channel(self, monitor_id: UUID):
+        """Queue a channel for (un)subscription on the next subscriber pass"""
+        self._pending_channels.add(monitor_id)
+        self._channels_changed.set()
 
+    def _ensure_subscriber(self):
         # Start Redis subscriber if not already running
         if self._subscriber_task is None and not self._shutdown:
             try:
@@ -35,98 +281,165 @@ class WebSocketManager:
                 logger.debug("Exception details", exc_info=True)
                 # Don't fail the connection, just log the error
 
+    async def connect(self, websocket: WebSocket, monitor_id: UUID):
+        self.subscribe(websocket, [monitor_id])
+
         logger.info(
             f"WebSocket connected for monitor {monitor_id}. Total connections: {len(self.active_connections[monitor_id])}"
         )
 
     def disconnect(self, websocket: WebSocket, monitor_id: UUID):
         """Remove WebSocket connection"""
-        if monitor_id in self.active_connections:
-            self.active_connections[monitor_id].discard(websocket)
+        self.unsubscribe(websocket, [monitor_id])
 
-            # Clean up empty sets
-            if not self.active_connections[monitor_id]:
-                del self.active_connections[monitor_id]
+        client = self.clients.get(websocket)
+        if client is not None and not client.monitor_ids:
+            self.unregister(websocket)
 
         logger.info(f"WebSocket disconnected for monitor {monitor_id}")
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
-        """Send message to specific WebSocket"""
+        """Queue a message for a specific WebSocket, behind any pending broadcasts"""
+        client = self.clients.get(websocket)
+        if client is not None:
+            client.enqueue(message)
+            return
+
         try:
             await websocket.send_text(message)
         except Exception as e:
             logger.error(f"Failed to send WebSocket message: {e}")
 
-    async def broadcast_to_monitor(self, monitor_id: UUID, message: str):
-        """Broadcast message to all WebSockets for a specific monitor"""
+    def send_updates(self, websocket: WebSocket, payloads: List[str]):
+        """Queue already-serialized status updates for one WebSocket as a single frame"""
+        client = self.clients.get(websocket)
+        if client is None or not payloads:
+            return
+        if len(payloads) == 1:
+            client.enqueue(payloads[0])
+        else:
+            client.enqueue(BATCH_PREFIX + ",".join(payloads) + BATCH_SUFFIX)
+
+    def broadcast_to_monitor(self, monitor_id: UUID, message: str):
+        """Queue a message for every WebSocket subscribed to a monitor"""
         if monitor_id not in self.active_connections:
             logger.debug(f"No active connections for monitor {monitor_id}")
             return
 
-        disconnected = []
-        successful_sends = 0
+        for client in list(self.active_connections[monitor_id]):
+            if not client.enqueue(message, key=monitor_id):
+                self._forget(client)
+
+    def _forget(self, client: ClientConnection):
+        """Drop a closed or evicted client from every subscription"""
+        for monitor_id in client.monitor_ids:
+            self._remove_subscriber(monitor_id, client)
+        client.monitor_ids.clear()
+        if self.clients.pop(client.websocket, None) is not None:
+            self._retire(client)
+
+    def _retire(self, client: ClientConnection):
+        self._retired_stats["sent"] += client.sent
+        self._retired_stats["dropped"] += client.dropped
+        self._retired_stats["resyncs"] += client.resyncs
+        self._retired_stats["batches"] += client.batches
+        self._retired_stats["evictions"] += int(client.evicted)
+
+    async def _sync_channels(self, pubsub):
+        """Apply pending channel changes with one SUBSCRIBE and one UNSUBSCRIBE"""
+        pending, self._pending_channels = self._pending_channels, set()
+        to_subscribe = [
+            monitor_id for monitor_id in pending
+            if monitor_id in self.active_connections and monitor_id not in self._subscribed_channels
+        ]
+        to_unsubscribe = [
+            monitor_id for monitor_id in pending
+            if monitor_id not in self.active_connections and monitor_id in self._subscribed_channels
+        ]
 
-        for websocket in self.active_connections[monitor_id]:
-            try:
-                await websocket.send_text(message)
-                successful_sends += 1
-            except Exception as e:
-                logger.error(f"Failed to broadcast to WebSocket for monitor {monitor_id}: {e}")
-                disconnected.append(websocket)
+        try:
+            if to_subscribe:
+                await pubsub.subscribe(*(status_channel(monitor_id) for monitor_id in to_subscribe))
+                self._subscribed_channels.update(to_subscribe)
+            if to_unsubscribe:
+                await pubsub.unsubscribe(*(status_channel(monitor_id) for monitor_id in to_unsubscribe))
+                self._subscribed_channels.difference_update(to_unsubscribe)
+        except Exception:
+            # Retry the whole set after the subscriber reconnects
+            self._pending_channels.update(pending)
+            raise
+
+        self.channel_changes += len(to_subscribe) + len(to_unsubscribe)
+
+    def _handle_message(self, message: dict):
+        try:
+            # Extract monitor_id from channel name (monitor:uuid)
+            channel = message["channel"].decode() if isinstance(message["channel"], bytes) else message["channel"]
+            monitor_id = UUID(channel.split(":", 1)[1])
 
-        # Clean up disconnected WebSockets
-        for websocket in disconnected:
-            self.active_connections[monitor_id].discard(websocket)
+            # Get message data
+            data = message["data"]
+            if isinstance(data, bytes):
+                data = data.decode()
 
-        logger.debug(f"Broadcasted to {successful_sends} WebSockets for monitor {monitor_id}")
+            # Queue for all connected WebSockets for this monitor
+            self.broadcast_to_monitor(monitor_id, data)
+
+        except Exception as e:
+            logger.error(f"Error processing Redis message: {e}")
+            logger.debug(f"Message details: {message}")
 
     async def _redis_subscriber(self):
-        """Subscribe to Redis channels and broadcast to WebSockets"""
+        """Follow the Redis channels of monitors with local viewers and broadcast to WebSockets.
+
+        Only exact `monitor:{id}` channels for locally watched monitors are
+        subscribed, so a node receives updates in proportion to its own
+        audience rather than the cluster's check volume.
+        """
         logger.info("Starting Redis subscriber for WebSocket broadcasts")
 
-        try:
+        while not self._shutdown:
             pubsub = self.redis.pubsub()
-            await pubsub.psubscribe("monitor:*")
-
-            async for message in pubsub.listen():
-                if self._shutdown:
-                    break
-
-                if message["type"] == "pmessage":
-                    try:
-                        # Extract monitor_id from channel name (monitor:uuid)
-                        channel = message["channel"].decode() if isinstance(message["channel"], bytes) else message[
-                            "channel"]
-                        monitor_id_str = channel.split(":", 1)[1]
-                        monitor_id = UUID(monitor_id_str)
-
-                        # Get message data
-                        data = message["data"]
-                        if isinstance(data, bytes):
-                            data = data.decode()
-
-                        # Broadcast to all connected WebSockets for this monitor
-                        await self.broadcast_to_monitor(monitor_id, data)
+            self._subscribed_channels = set()
+            self._pending_channels.update(self.active_connections.keys())
+            try:
+                while not self._shutdown:
+                    await self._sync_channels(pubsub)
+
+                    if not self._subscribed_channels:
+                        # Nothing to listen to until a client subscribes
+                        if not self._pending_channels:
+                            self._channels_changed.clear()
+                            await self._channels_changed.wait()
+                        continue
+
+                    # Short reads so channel changes are applied promptly
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=settings.WS_CHANNEL_SYNC_INTERVAL_MS / 1000,
+                    )
+                    if message and message["type"] == "message":
+                        self._handle_message(message)
 
-                    except Exception as e:
-                        logger.error(f"Error processing Redis message: {e}")
-                        logger.debug(f"Message details: {message}")
+            except asyncio.CancelledError:
+                logger.info("Redis subscriber cancelled")
+                raise
+            except Exception as e:
+                logger.error(f"Redis subscriber error: {e}")
+                await asyncio.sleep(1)  # Brief pause before resubscribing
+            finally:
+                try:
+                    await pubsub.unsubscribe()
+                    await pubsub.aclose()
+                except:
+                    pass
 
-        except asyncio.CancelledError:
-            logger.info("Redis subscriber cancelled")
-        except Exception as e:
-            logger.error(f"Redis subscriber error: {e}")
-        finally:
-            try:
-                await pubsub.unsubscribe()
-                await pubsub.close()
-            except:
-                pass
-            logger.info("Redis subscriber stopped")
+        logger.info("Redis subscriber stopped")
 
     async def shutdown(self):
         """Shutdown the WebSocket manager"""
         self._shutdown = True
+        self._channels_changed.set()
 
         if self._subscriber_task:
             self._subscriber_task.cancel()
@@ -136,26 +449,34 @@ class WebSocketManager:
                 pass
 
         # Close all active connections
-        for monitor_id, websockets in self.active_connections.items():
-            for websocket in websockets.copy():
-                try:
-                    await websocket.close()
-                except:
-                    pass
+        for client in list(self.clients.values()):
+            await client.aclose()
+            try:
+                await client.websocket.close()
+            except:
+                pass
 
+        self.clients.clear()
         self.active_connections.clear()
         logger.info("WebSocket manager shutdown complete")
 
     async def get_connection_stats(self) -> dict:
         """Get statistics about active connections"""
-        total_connections = sum(len(websockets) for websockets in self.active_connections.values())
+        clients = list(self.clients.values())
+        total_connections = sum(len(clients) for clients in self.active_connections.values())
         return {
             "total_connections": total_connections,
             "monitors_with_connections": len(self.active_connections),
-            "connections_per_monitor": {
-                str(monitor_id): len(websockets)
-                for monitor_id, websockets in self.active_connections.items()
-            }
+            "clients": len(clients),
+            "send_queue_depth": sum(client.queue_depth for client in clients),
+            "max_send_queue_depth": max((client.queue_depth for client in clients), default=0),
+            "messages_sent": self._retired_stats["sent"] + sum(client.sent for client in clients),
+            "messages_dropped": self._retired_stats["dropped"] + sum(client.dropped for client in clients),
+            "resyncs": self._retired_stats["resyncs"] + sum(client.resyncs for client in clients),
+            "batched_frames": self._retired_stats["batches"] + sum(client.batches for client in clients),
+            "evictions": self._retired_stats["evictions"],
+            "subscribed_channels": len(self._subscribed_channels),
+            "channel_changes": self.channel_changes,
         }
 
 
@@ -0,0 +1,61 @@
+"""Run the monitor worker on its own, without the API: python -m app.workers
+
+With WORKER_PROCESSES > 1 (or 0 for one per CPU core) this process becomes a
+supervisor over that many worker processes.
+"""
+import asyncio
+import logging
+import os
+import signal
+from app.core.config import settings
+from app.core.database import create_db_and_tables
+from app.workers.health import WorkerHealthServer
+from app.workers.monitor_worker import monitor_worker
+from app.workers.runtime import close_connections, run_event_loop
+from app.workers.supervisor import WorkerSupervisor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def run():
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    logger.info("Starting PulseCheck worker...")
+    await create_db_and_tables()
+
+    processes = settings.WORKER_PROCESSES or os.cpu_count() or 1
+    worker = WorkerSupervisor(processes) if processes > 1 else monitor_worker
+
+    health_server = WorkerHealthServer(
+        host=settings.WORKER_HEALTH_HOST,
+        port=settings.WORKER_HEALTH_PORT,
+        is_ready=lambda: worker.is_ready,
+        get_stats=worker.get_stats,
+    )
+    await health_server.start()
+    await worker.start()
+
+    logger.info("PulseCheck worker started")
+    await stop_event.wait()
+
+    logger.info("Shutting down PulseCheck worker...")
+    await worker.stop()
+    await health_server.stop()
+    await close_connections()
+    logger.info("PulseCheck worker shutdown complete")
+
+
+def main():
+    run_event_loop(run())
+
+
+if __name__ == "__main__":
+    main()
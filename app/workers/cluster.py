@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import time
+from typing import Awaitable, Callable, Hashable, List, Optional
+from app.core.database import redis_client
+
+logger = logging.getLogger(__name__)
+
+MEMBERS_KEY = "workers:members"
+
+
+def _weight(member: str, key: Hashable) -> int:
+    digest = hashlib.blake2b(f"{member}|{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def rendezvous_owner(members: List[str], key: Hashable) -> Optional[str]:
+    """Pick the member with the highest hash weight for a key"""
+    if not members:
+        return None
+    return max(members, key=lambda member: _weight(member, key))
+
+
+class ClusterMembership:
+    """Worker membership in Redis with heartbeats and rendezvous-hash ownership.
+
+    Every worker keeps its heartbeat in a sorted set scored by time; members
+    whose heartbeat is older than `member_ttl` are evicted. Each key is owned by
+    the live member with the highest hash weight for it, so when a member joins
+    or leaves only the keys it wins or held change owner.
+    """
+
+    def __init__(self, heartbeat_interval: float, member_ttl: float):
+        self.heartbeat_interval = heartbeat_interval
+        self.member_ttl = member_ttl
+        self.redis = redis_client
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.members: List[str] = [self.worker_id]
+        self._on_change: Optional[Callable[[], Awaitable[None]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def owns(self, key: Hashable) -> bool:
+        return rendezvous_owner(self.members, key) == self.worker_id
+
+    async def start(self, on_change: Optional[Callable[[], Awaitable[None]]] = None):
+        """Register this worker and start heartbeating"""
+        if self._task:
+            return
+
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.members = [self.worker_id]
+        self._on_change = on_change
+        try:
+            await self._heartbeat()
+        except Exception as e:
+            logger.error(f"Failed to register worker {self.worker_id}: {e}")
+        self._task = asyncio.create_task(self._heartbeat_loop())
+        logger.info(f"Worker {self.worker_id} joined cluster with {len(self.members)} member(s)")
+
+    async def stop(self):
+        """Stop heartbeating and leave the cluster so peers take over immediately"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await self.redis.zrem(MEMBERS_KEY, self.worker_id)
+        except Exception as e:
+            logger.error(f"Failed to deregister worker {self.worker_id}: {e}")
+        logger.info(f"Worker {self.worker_id} left cluster")
+
+    async def _heartbeat(self):
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(MEMBERS_KEY, {self.worker_id: now})
+            pipe.zremrangebyscore(MEMBERS_KEY, "-inf", now - self.member_ttl)
+            pipe.zrange(MEMBERS_KEY, 0, -1)
+            _, _, members = await pipe.execute()
+
+        members = sorted(set(members) | {self.worker_id})
+        if members != self.members:
+            logger.info(f"Cluster membership changed: {len(self.members)} -> {len(members)} member(s)")
+            self.members = members
+            if self._on_change:
+                await self._on_change()
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self._heartbeat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the last known membership until Redis is reachable again
+                logger.error(f"Cluster heartbeat failed: {e}")
+
+    def get_stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "members": len(self.members),
+        }
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerHealthServer:
+    """Minimal HTTP endpoint for a standalone worker's liveness and readiness probes.
+
+    GET /health always answers 200 while the process is serving; GET /ready
+    answers 200 once `is_ready()` is true and 503 otherwise. Both return the
+    worker's stats as JSON.
+    """
+
+    def __init__(self, host: str, port: int, is_ready: Callable[[], bool], get_stats: Callable[[], dict]):
+        self.host = host
+        self.port = port
+        self.is_ready = is_ready
+        self.get_stats = get_stats
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Worker health endpoint listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            parts = request_line.decode(errors="replace").split()
+            path = parts[1] if len(parts) > 1 else "/"
+
+            ready = self.is_ready()
+            if path == "/health":
+                code, body = 200, {"status": "healthy", "ready": ready}
+            elif path == "/ready":
+                code, body = (200, {"status": "ready"}) if ready else (503, {"status": "not ready"})
+            else:
+                code, body = 404, {"detail": "Not Found"}
+
+            if code != 404:
+                body["worker"] = self.get_stats()
+
+            payload = json.dumps(body, default=str).encode()
+            reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}[code]
+            writer.write(
+                f"HTTP/1.1 {code} {reason}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"Health request failed: {e}")
+        finally:
+            writer.close()
@@ -1,8 +1,25 @@
 import asyncio
 import logging
-from datetime import datetime
+import random
+from typing import Dict, Optional, Set
+from uuid import UUID
+from app.core.config import settings
 from app.core.database import async_session
+from app.models.monitor import Monitor, MonitorStatus
+from app.schemas.monitor import MonitorStatusUpdate
+from app.services.alert_digest import alert_coalescer
+from app.services.alert_outbox import alert_delivery, alert_outbox_writer
+from app.services.check_history import check_history_writer
+from app.services.http_client import probe_client
+from app.services.latency import latency_tracker
+from app.services.rollups import rollup_writer
+from app.services.status_writer import status_writer
 from app.services.uptime import UptimeService
+from app.workers.cluster import ClusterMembership
+from app.workers.probe_executor import ProbeExecutor, probe_host
+from app.workers.probe_groups import ProbeGroup, ProbeGroups
+from app.workers.registry import MonitorRegistry
+from app.workers.scheduler import MonitorScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -10,8 +27,33 @@ logger = logging.getLogger(__name__)
 class MonitorWorker:
     def __init__(self):
         self.uptime_service = UptimeService()
+        self.scheduler = MonitorScheduler()
+        self.executor = ProbeExecutor(
+            max_concurrency=settings.PROBE_MAX_CONCURRENCY,
+            per_host_limit=settings.PROBE_PER_HOST_LIMIT,
+            queue_size=settings.PROBE_QUEUE_SIZE,
+        )
+        self.cluster = ClusterMembership(
+            heartbeat_interval=settings.CLUSTER_HEARTBEAT_INTERVAL,
+            member_ttl=settings.CLUSTER_MEMBER_TTL,
+        )
+        self.registry = MonitorRegistry(reconcile_interval=settings.MONITOR_CHECK_INTERVAL)
         self.is_running = False
         self._task = None
+        # Monitors probing the same URL with the same settings share one probe;
+        # the scheduler, cluster ownership and in-flight set are keyed by group
+        self.groups = ProbeGroups()
+        self._in_flight: Set[str] = set()
+        # Groups with an unconfirmed failure -> re-checks made so far
+        self._confirming: Dict[str, int] = {}
+
+        # Confirmation stats
+        self.confirmed_down = 0
+        self.false_alarms = 0
+
+    @property
+    def is_ready(self) -> bool:
+        return self.is_running and self.registry.is_loaded
 
     async def start(self):
         """Start the monitoring worker"""
@@ -19,6 +61,17 @@ class MonitorWorker:
             return
 
         self.is_running = True
+        await status_writer.start()
+        await check_history_writer.start()
+        await rollup_writer.start()
+        await latency_tracker.start()
+        await alert_outbox_writer.start()
+        await alert_delivery.start()
+        await self.executor.start()
+        await self.cluster.start(on_change=self._rebalance)
+        await self.registry.start(
+            on_upsert=self._on_monitor_upsert, on_remove=self._on_monitor_remove, on_check=self._on_manual_check
+        )
         self._task = asyncio.create_task(self._monitor_loop())
         logger.info("Monitor worker started")
 
@@ -32,53 +85,212 @@ class MonitorWorker:
             except asyncio.CancelledError:
                 pass
 
-        await self.uptime_service.close()
+        await self.registry.stop()
+        self.groups.clear()
+
+        await self.executor.stop()
+        self._in_flight.clear()
+        await status_writer.stop()
+        await check_history_writer.stop()
+        await rollup_writer.stop()
+        await latency_tracker.stop()
+        await alert_coalescer.stop()
+        await alert_outbox_writer.stop()
+        await alert_delivery.stop()
+        await self.cluster.stop()
+
         logger.info("Monitor worker stopped")
 
+    def _on_monitor_upsert(self, monitor: Monitor, interval_changed: bool):
+        """Place a new or changed monitor in its probe group and schedule the group if owned"""
+        old_key = self.groups.key_of(monitor.id)
+        old_interval = None
+        if old_key is not None and old_key in self.scheduler:
+            old_interval = self.groups.get(old_key).interval
+
+        group = self.groups.add(monitor)
+        if old_key is not None and old_key != group.key:
+            self._group_changed(old_key)
+            interval_changed = True
+        elif old_interval is not None and group.interval != old_interval:
+            interval_changed = True
+
+        self._schedule_group(group, interval_changed)
+
+    def _on_monitor_remove(self, monitor_id: UUID, deleted: bool):
+        latency_tracker.forget(monitor_id)
+        if deleted:
+            # A paused monitor's pending deltas are still written
+            rollup_writer.discard(monitor_id)
+        group = self.groups.remove(monitor_id)
+        if group is not None:
+            self._group_changed(group.key)
+
+    async def _on_manual_check(self, group_key: str, status_update: MonitorStatusUpdate):
+        """Record a manual check from the API if this worker owns the monitor's probe group.
+
+        Recording it here keeps the owner's in-memory status, which drives
+        alerting, in step with the result written to the database.
+        """
+        monitor = self.registry.get(status_update.monitor_id)
+        if monitor is not None:
+            group_key = self.groups.key_of(monitor.id) or group_key
+        if not self.cluster.owns(group_key):
+            return
+
+        if monitor is None:
+            # Paused monitors are not in the registry; record against the stored row
+            async with async_session() as session:
+                monitor = await session.get(Monitor, status_update.monitor_id)
+            if monitor is None:
+                return
+
+        await self.uptime_service.record_status(monitor, status_update)
+
+    def _group_changed(self, key: str):
+        """Unschedule an emptied group, or reschedule one whose shortest interval grew"""
+        group = self.groups.get(key)
+        if group is None:
+            self._unschedule(key)
+        else:
+            self._schedule_group(group, interval_changed=True)
+
+    def _schedule_group(self, group: ProbeGroup, interval_changed: bool):
+        if not self.cluster.owns(group.key):
+            self._unschedule(group.key)
+        elif interval_changed or group.key not in self.scheduler:
+            due_in = min(self.uptime_service.seconds_until_due(monitor) for monitor in group)
+            self.scheduler.schedule_in(group.key, due_in)
+
+    def _unschedule(self, key: str):
+        self.scheduler.remove(key)
+        self._confirming.pop(key, None)
+
+    async def _rebalance(self):
+        """Pick up groups this worker now owns and drop handed-off ones"""
+        for group in self.groups:
+            self._schedule_group(group, interval_changed=False)
+
     async def _monitor_loop(self):
-        """Main monitoring loop"""
+        """Main monitoring loop: sleep until the next deadline and dispatch due checks"""
         while self.is_running:
             try:
-                await self._check_all_monitors()
-                await asyncio.sleep(30)  # Check every 30 seconds
+                for key, intended in await self.scheduler.wait_for_due():
+                    await self._dispatch(key, intended)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}")
                 await asyncio.sleep(5)  # Brief pause before retrying
 
-    async def _check_all_monitors(self):
-        """Check all active monitors"""
-        try:
-            monitors = await self.uptime_service.get_active_monitors()
+    async def _dispatch(self, key: str, intended: float):
+        """Queue a due group probe and schedule the group's next one"""
+        group = self.groups.get(key)
+        if group is None:
+            return
 
-            # Check which monitors need to be checked
-            tasks = []
-            for monitor in monitors:
-                if await self.uptime_service.should_check_monitor(monitor):
-                    tasks.append(self._check_single_monitor(monitor))
+        # Anchor the next deadline to the intended start so drift doesn't accumulate
+        next_due = intended + group.interval
+        self.scheduler.schedule(key, max(next_due, self.scheduler.now()))
 
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+        if key in self._in_flight:
+            logger.debug(f"Skipping probe group {key}: previous check still running")
+            return
 
-        except Exception as e:
-            logger.error(f"Error checking monitors: {e}")
+        # Blocks while the probe queue is full, holding back further dispatches
+        self._in_flight.add(key)
+        await self.executor.submit(
+            probe_host(group.representative.url), self._check_group, group, intended
+        )
+
+    async def _check_group(self, group: ProbeGroup, intended: Optional[float] = None):
+        """Probe a group once and fan the result out to every member"""
+        if intended is not None:
+            self.scheduler.record_start(intended)
 
-    async def _check_single_monitor(self, monitor):
-        """Check a single monitor"""
         try:
-            # Perform the uptime check
-            status_update = await self.uptime_service.check_monitor(monitor)
+            monitor = group.representative
 
-            # Update database and send notifications
-            async with async_session() as session:
-                await self.uptime_service.update_monitor_status(session, status_update)
+            # Perform the uptime check; re-checks use the full timeout so an
+            # over-tight adaptive one can't confirm an outage
+            status_update = await self.uptime_service.check_monitor(
+                monitor, adaptive_timeout=group.key not in self._confirming
+            )
 
-            logger.debug(f"Checked monitor {monitor.id}: {status_update.status}")
+            held_back = self._awaiting_confirmation(group, status_update)
+
+            # Queue the database updates and send notifications
+            for member in group:
+                if held_back and member.status != MonitorStatus.DOWN:
+                    continue
+                await self.uptime_service.record_status(
+                    member, status_update.model_copy(update={"monitor_id": member.id})
+                )
+
+            logger.debug(f"Checked probe group {group.key} ({len(group)} monitors): {status_update.status}")
 
         except Exception as e:
-            logger.error(f"Error checking monitor {monitor.id}: {e}")
+            logger.error(f"Error checking probe group {group.key}: {e}")
+        finally:
+            self._in_flight.discard(group.key)
+
+    def _awaiting_confirmation(self, group: ProbeGroup, status_update: MonitorStatusUpdate) -> bool:
+        """Hold back a failure that would flip members to DOWN and re-check the group soon.
+
+        Members only go DOWN once PROBE_CONFIRM_RETRIES re-checks, spaced by
+        jittered exponential backoff, have failed as well.
+        """
+        attempts = self._confirming.pop(group.key, None)
+        if status_update.status != MonitorStatus.DOWN:
+            if attempts is not None:
+                self.false_alarms += 1
+            return False
+        if all(member.status == MonitorStatus.DOWN for member in group):
+            return False
+
+        attempts = attempts or 0
+        if attempts >= settings.PROBE_CONFIRM_RETRIES:
+            if attempts:
+                self.confirmed_down += 1
+            return False
+
+        # Only re-check groups this worker still schedules
+        if group.key not in self.scheduler:
+            return False
+
+        self._confirming[group.key] = attempts + 1
+        delay = settings.PROBE_CONFIRM_DELAY * 2 ** attempts * random.uniform(0.5, 1.5)
+        self.scheduler.schedule_in(group.key, min(delay, group.interval))
+        logger.debug(f"Probe group {group.key} failed ({status_update.error_message}), re-checking in {delay:.1f}s")
+        return True
+
+    def get_stats(self) -> dict:
+        """Get statistics about the worker"""
+        return {
+            "is_running": self.is_running,
+            "is_ready": self.is_ready,
+            "cluster": self.cluster.get_stats(),
+            "registry": self.registry.get_stats(),
+            "scheduled_groups": len(self.scheduler),
+            "probe_groups": self.groups.get_stats(),
+            "in_flight": len(self._in_flight),
+            "confirmation": {
+                "pending": len(self._confirming),
+                "confirmed_down": self.confirmed_down,
+                "false_alarms": self.false_alarms,
+            },
+            "scheduler": self.scheduler.get_stats(),
+            "executor": self.executor.get_stats(),
+            "probe_client": probe_client.get_stats(),
+            "status_writer": status_writer.get_stats(),
+            "check_history_writer": check_history_writer.get_stats(),
+            "rollup_writer": rollup_writer.get_stats(),
+            "latency_tracker": latency_tracker.get_stats(),
+            "alert_coalescer": alert_coalescer.get_stats(),
+            "alert_outbox_writer": alert_outbox_writer.get_stats(),
+            "alert_delivery": alert_delivery.get_stats(),
+        }
 
 
 # Global worker instance
-monitor_worker = MonitorWorker()
\ No newline at end of file
+monitor_worker = MonitorWorker()
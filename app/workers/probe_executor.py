@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+def probe_host(url: str) -> str:
+    """Host key used for per-host connection limits"""
+    parts = urlsplit(url)
+    return (parts.hostname or "").lower()
+
+
+@dataclass
+class _ProbeJob:
+    host: str
+    fn: Callable[..., Awaitable[Any]]
+    args: Tuple[Any, ...]
+    enqueued_at: float = 0.0
+
+
+class ProbeExecutor:
+    """Bounded probe queue with a global concurrency limit and a per-host limit.
+
+    `submit` blocks when the queue is full, which pushes backpressure onto the
+    scheduler instead of opening unbounded sockets. Jobs for a host that is
+    already at its limit are parked without holding a global slot, and the slot
+    of a finishing job is handed straight to the next parked job for its host.
+    """
+
+    def __init__(self, max_concurrency: int, per_host_limit: int, queue_size: int):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._host_active: Dict[str, int] = {}
+        self._host_waiting: Dict[str, Deque[_ProbeJob]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Stats
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_last_ms = 0.0
+        self.wait_max_ms = 0.0
+        self._wait_total_ms = 0.0
+        self._started = 0
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_running_loop().time()
+
+    async def start(self):
+        self._stopping = False
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self):
+        """Cancel the dispatcher and every running probe"""
+        self._stopping = True
+        tasks = list(self._tasks)
+        if self._dispatcher:
+            tasks.append(self._dispatcher)
+            self._dispatcher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._host_active.clear()
+        self._host_waiting.clear()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    async def submit(self, host: str, fn: Callable[..., Awaitable[Any]], *args):
+        """Queue a probe, waiting for room if the queue is full"""
+        self.submitted += 1
+        await self._queue.put(_ProbeJob(host, fn, args, self._now()))
+
+    async def _dispatch_loop(self):
+        while True:
+            job = await self._queue.get()
+            await self._slots.acquire()
+
+            if self._host_active.get(job.host, 0) >= self.per_host_limit:
+                self._host_waiting.setdefault(job.host, deque()).append(job)
+                self._slots.release()
+                continue
+
+            self._start(job)
+
+    def _start(self, job: _ProbeJob):
+        self._host_active[job.host] = self._host_active.get(job.host, 0) + 1
+
+        wait_ms = (self._now() - job.enqueued_at) * 1000
+        self._started += 1
+        self.wait_last_ms = wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self._wait_total_ms += wait_ms
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: _ProbeJob):
+        try:
+            await job.fn(*job.args)
+            self.completed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Probe for host {job.host} failed: {e}")
+        finally:
+            self._finish(job.host)
+
+    def _finish(self, host: str):
+        self._host_active[host] -= 1
+
+        # Hand the global slot to the next parked job for the same host
+        waiting = self._host_waiting.get(host)
+        if waiting and not self._stopping:
+            job = waiting.popleft()
+            if not waiting:
+                del self._host_waiting[host]
+            self._start(job)
+            return
+
+        if not self._host_active[host]:
+            del self._host_active[host]
+        self._slots.release()
+
+    def get_stats(self) -> dict:
+        """Get queue depth, concurrency and wait time statistics"""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "parked": sum(len(jobs) for jobs in self._host_waiting.values()),
+            "running": len(self._tasks),
+            "max_concurrency": self.max_concurrency,
+            "per_host_limit": self.per_host_limit,
+            "busy_hosts": len(self._host_active),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_ms": {
+                "last": round(self.wait_last_ms, 2),
+                "max": round(self.wait_max_ms, 2),
+                "avg": round(self._wait_total_ms / self._started, 2) if self._started else 0.0,
+            },
+        }
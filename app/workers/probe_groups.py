@@ -0,0 +1,117 @@
+import hashlib
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit, urlunsplit
+from uuid import UUID
+from app.models.monitor import Monitor
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a probe URL: lowercase scheme and host, no default port, no fragment"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username or parts.password:
+        userinfo = parts.username or ""
+        if parts.password is not None:
+            userinfo += f":{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def probe_group_key(monitor: Monitor) -> str:
+    """Monitors with the same key send identical requests and evaluate them identically"""
+    canonical = "\n".join((
+        monitor.method or "GET",
+        normalize_url(monitor.url),
+        str(monitor.max_body_bytes or ""),
+        monitor.body_keyword or "",
+        monitor.body_regex or "",
+    ))
+    return hashlib.blake2b(canonical.encode(), digest_size=12).hexdigest()
+
+
+class ProbeGroup:
+    """Monitors sharing one probe, run at the shortest interval among them"""
+
+    __slots__ = ("key", "members")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.members: Dict[UUID, Monitor] = {}
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __iter__(self) -> Iterator[Monitor]:
+        return iter(list(self.members.values()))
+
+    @property
+    def interval(self) -> int:
+        return min(monitor.interval for monitor in self.members.values())
+
+    @property
+    def representative(self) -> Monitor:
+        """The member whose settings and latency history drive the shared probe"""
+        return next(iter(self.members.values()))
+
+
+class ProbeGroups:
+    """Tracks which probe group every active monitor belongs to"""
+
+    def __init__(self):
+        self._groups: Dict[str, ProbeGroup] = {}
+        self._group_of: Dict[UUID, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __iter__(self) -> Iterator[ProbeGroup]:
+        return iter(list(self._groups.values()))
+
+    def get(self, key: str) -> Optional[ProbeGroup]:
+        return self._groups.get(key)
+
+    def key_of(self, monitor_id: UUID) -> Optional[str]:
+        return self._group_of.get(monitor_id)
+
+    def add(self, monitor: Monitor) -> ProbeGroup:
+        """Place a monitor in the group for its current settings"""
+        key = probe_group_key(monitor)
+        if self._group_of.get(monitor.id) != key:
+            self.remove(monitor.id)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = ProbeGroup(key)
+        group.members[monitor.id] = monitor
+        self._group_of[monitor.id] = key
+        return group
+
+    def remove(self, monitor_id: UUID) -> Optional[ProbeGroup]:
+        """Take a monitor out of its group; returns the group, which may now be empty"""
+        key = self._group_of.pop(monitor_id, None)
+        if key is None:
+            return None
+        group = self._groups[key]
+        group.members.pop(monitor_id, None)
+        if not group.members:
+            del self._groups[key]
+        return group
+
+    def clear(self):
+        self._groups.clear()
+        self._group_of.clear()
+
+    def get_stats(self) -> dict:
+        monitors = len(self._group_of)
+        return {
+            "groups": len(self._groups),
+            "grouped_monitors": monitors,
+            "probes_saved_ratio": round(1 - len(self._groups) / monitors, 3) if monitors else 0.0,
+        }
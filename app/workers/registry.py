@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+from sqlalchemy import func, select
+from app.core.database import async_session, redis_client
+from app.models.monitor import Monitor
+from app.schemas.monitor import MonitorStatusUpdate
+from app.services.monitor_events import MONITOR_CHANGES_CHANNEL, MONITOR_CHECKED, MONITOR_DELETED
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorRegistry:
+    """In-memory set of active monitors, loaded once and kept current by change events.
+
+    The API publishes monitor ids to MONITOR_CHANGES_CHANNEL after creating,
+    updating or deleting monitors; the registry re-reads just those rows. A
+    periodic `count(*)`/`max(updated_at)` comparison triggers a full reload if
+    an event was missed.
+    """
+
+    def __init__(self, reconcile_interval: float):
+        self.reconcile_interval = reconcile_interval
+        self.redis = redis_client
+        self.is_loaded = False
+        self._monitors: Dict[UUID, Monitor] = {}
+        self._on_upsert: Optional[Callable[[Monitor, bool], None]] = None
+        self._on_remove: Optional[Callable[[UUID, bool], None]] = None
+        self._on_check: Optional[Callable[[str, MonitorStatusUpdate], Awaitable[None]]] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.events_received = 0
+        self.full_reloads = 0
+
+    def __len__(self) -> int:
+        return len(self._monitors)
+
+    def __iter__(self) -> Iterator[Monitor]:
+        return iter(list(self._monitors.values()))
+
+    def get(self, monitor_id: UUID) -> Optional[Monitor]:
+        return self._monitors.get(monitor_id)
+
+    async def start(
+            self,
+            on_upsert: Callable[[Monitor, bool], None],
+            on_remove: Callable[[UUID, bool], None],
+            on_check: Callable[[str, MonitorStatusUpdate], Awaitable[None]],
+    ):
+        """Load the active monitors and start following change events"""
+        self._on_upsert = on_upsert
+        self._on_remove = on_remove
+        self._on_check = on_check
+        self._listener_task = asyncio.create_task(self._listen())
+        self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self):
+        tasks = [task for task in (self._listener_task, self._reconcile_task) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._listener_task = self._reconcile_task = None
+        self._monitors.clear()
+        self.is_loaded = False
+
+    def _upsert(self, monitor: Monitor):
+        previous = self._monitors.get(monitor.id)
+        if previous is None:
+            self._monitors[monitor.id] = monitor
+            self._on_upsert(monitor, True)
+            return
+
+        # Refresh configuration only; the in-memory status is newer than
+        # the database until the status writer flushes
+        interval_changed = previous.interval != monitor.interval
+        previous.url = monitor.url
+        previous.name = monitor.name
+        previous.interval = monitor.interval
+        previous.method = monitor.method
+        previous.max_body_bytes = monitor.max_body_bytes
+        previous.body_keyword = monitor.body_keyword
+        previous.body_regex = monitor.body_regex
+        previous.updated_at = monitor.updated_at
+        self._on_upsert(previous, interval_changed)
+
+    def _remove(self, monitor_id: UUID, deleted: bool = False):
+        if self._monitors.pop(monitor_id, None) is not None:
+            self._on_remove(monitor_id, deleted)
+
+    async def reload(self):
+        """Replace the registry contents with a full read of the active monitors"""
+        async with async_session() as session:
+            result = await session.execute(select(Monitor).where(Monitor.is_active == True))
+            active = {monitor.id: monitor for monitor in result.scalars().all()}
+
+        for monitor_id in self._monitors.keys() - active.keys():
+            self._remove(monitor_id)
+        for monitor in active.values():
+            self._upsert(monitor)
+
+        self.full_reloads += 1
+        self.is_loaded = True
+        logger.info(f"Monitor registry loaded {len(self._monitors)} active monitors")
+
+    async def refresh(self, monitor_ids: Iterable[UUID]):
+        """Re-read specific monitors after a change event"""
+        ids: List[UUID] = list(monitor_ids)
+        async with async_session() as session:
+            result = await session.execute(select(Monitor).where(Monitor.id.in_(ids)))
+            found = {monitor.id: monitor for monitor in result.scalars().all()}
+
+        for monitor_id in ids:
+            monitor = found.get(monitor_id)
+            if monitor is not None and monitor.is_active:
+                self._upsert(monitor)
+            else:
+                self._remove(monitor_id, deleted=monitor is None)
+
+    async def _handle_event(self, data: str):
+        event = json.loads(data)
+        if event.get("op") == MONITOR_CHECKED:
+            await self._on_check(event["group_key"], MonitorStatusUpdate.model_validate(event["result"]))
+            return
+
+        monitor_ids = [UUID(monitor_id) for monitor_id in event.get("monitor_ids", [])]
+        self.events_received += 1
+
+        if event.get("op") == MONITOR_DELETED:
+            for monitor_id in monitor_ids:
+                self._remove(monitor_id, deleted=True)
+        else:
+            await self.refresh(monitor_ids)
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                # Subscribe before loading so no change between the two is missed
+                await pubsub.subscribe(MONITOR_CHANGES_CHANNEL)
+                await self.reload()
+
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        await self._handle_event(message["data"])
+                    except Exception as e:
+                        logger.error(f"Error handling monitor change event: {e}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Monitor registry listener error: {e}")
+                await asyncio.sleep(5)  # Brief pause before resubscribing
+            finally:
+                try:
+                    await pubsub.unsubscribe()
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _reconcile_loop(self):
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            if not self.is_loaded:
+                continue
+            try:
+                if await self._is_stale():
+                    logger.warning("Monitor registry out of sync with the database, reloading")
+                    await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Monitor registry reconciliation failed: {e}")
+
+    async def _is_stale(self) -> bool:
+        """Compare a cheap count/max(updated_at) fingerprint against the database"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(func.count(Monitor.id), func.max(Monitor.updated_at))
+                .where(Monitor.is_active == True)
+            )
+            count, max_updated_at = result.one()
+
+        local_max: Optional[datetime] = max(
+            (monitor.updated_at for monitor in self._monitors.values() if monitor.updated_at),
+            default=None,
+        )
+        return count != len(self._monitors) or max_updated_at != local_max
+
+    def get_stats(self) -> dict:
+        return {
+            "loaded": self.is_loaded,
+            "active_monitors": len(self._monitors),
+            "events_received": self.events_received,
+            "full_reloads": self.full_reloads,
+        }
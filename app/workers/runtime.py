@@ -0,0 +1,30 @@
+import asyncio
+import logging
+from typing import Coroutine
+from app.core.config import settings
+from app.core.database import engine, redis_binary_client, redis_client
+from app.services.http_client import probe_client
+
+logger = logging.getLogger(__name__)
+
+
+def run_event_loop(main: Coroutine):
+    """Run a worker entry point on uvloop when enabled and installed"""
+    if settings.WORKER_USE_UVLOOP:
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("uvloop is not installed, falling back to the default event loop")
+        else:
+            uvloop.run(main)
+            return
+
+    asyncio.run(main)
+
+
+async def close_connections():
+    """Close the process-wide HTTP, Redis and database clients"""
+    await probe_client.close()
+    await redis_client.aclose()
+    await redis_binary_client.aclose()
+    await engine.dispose()
@@ -0,0 +1,124 @@
+import asyncio
+import heapq
+import itertools
+from typing import Dict, Hashable, List, Tuple
+
+
+class MonitorScheduler:
+    """Min-heap of check deadlines on the event loop's monotonic clock.
+
+    Entries are keyed by an opaque hashable (a monitor id) and removed lazily:
+    rescheduling or removing a key leaves its old heap entry behind, and stale
+    entries are skipped when they reach the top of the heap.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+
+        # Drift metrics (actual start minus intended start)
+        self.dispatched = 0
+        self.drift_last_ms = 0.0
+        self.drift_max_ms = 0.0
+        self._drift_total_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    @staticmethod
+    def now() -> float:
+        return asyncio.get_running_loop().time()
+
+    def schedule(self, key: Hashable, due: float):
+        """Schedule (or reschedule) a key at a monotonic deadline"""
+        self._deadlines[key] = due
+        heapq.heappush(self._heap, (due, next(self._counter), key))
+
+        # Wake the dispatcher if this is now the earliest deadline
+        if self._heap[0][2] == key:
+            self._wakeup.set()
+
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._compact()
+
+    def schedule_in(self, key: Hashable, delay: float):
+        """Schedule a key `delay` seconds from now"""
+        self.schedule(key, self.now() + max(0.0, delay))
+
+    def remove(self, key: Hashable):
+        """Unschedule a key; its heap entry is discarded lazily"""
+        self._deadlines.pop(key, None)
+
+    def deadline(self, key: Hashable):
+        return self._deadlines.get(key)
+
+    def _is_stale(self, entry: Tuple[float, int, Hashable]) -> bool:
+        due, _, key = entry
+        return self._deadlines.get(key) != due
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if not self._is_stale(entry)]
+        heapq.heapify(self._heap)
+
+    def _discard_stale_head(self):
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, now: float) -> List[Tuple[Hashable, float]]:
+        due_entries = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if self._is_stale(entry):
+                continue
+            due, _, key = entry
+            del self._deadlines[key]
+            due_entries.append((key, due))
+        return due_entries
+
+    async def wait_for_due(self) -> List[Tuple[Hashable, float]]:
+        """Sleep until the earliest deadline and return every (key, due) that is ready"""
+        while True:
+            self._discard_stale_head()
+            now = self.now()
+            due_entries = self._pop_due(now)
+            if due_entries:
+                return due_entries
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def record_start(self, intended: float):
+        """Record scheduling drift for a check that is starting now"""
+        drift_ms = max(0.0, (self.now() - intended) * 1000)
+        self.dispatched += 1
+        self.drift_last_ms = drift_ms
+        self.drift_max_ms = max(self.drift_max_ms, drift_ms)
+        self._drift_total_ms += drift_ms
+
+    def get_stats(self) -> dict:
+        """Get scheduler size and drift statistics"""
+        self._discard_stale_head()
+        next_due_in = None
+        if self._heap:
+            next_due_in = round(max(0.0, self._heap[0][0] - self.now()), 3)
+
+        return {
+            "scheduled": len(self._deadlines),
+            "heap_size": len(self._heap),
+            "next_due_in_seconds": next_due_in,
+            "dispatched": self.dispatched,
+            "drift_ms": {
+                "last": round(self.drift_last_ms, 2),
+                "max": round(self.drift_max_ms, 2),
+                "avg": round(self._drift_total_ms / self.dispatched, 2) if self.dispatched else 0.0,
+            },
+        }
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from multiprocessing.connection import Connection
+from typing import List, Optional
+from app.core.config import settings
+from app.workers.runtime import close_connections, run_event_loop
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_child(conn: Connection):
+    from app.workers.monitor_worker import monitor_worker
+
+    stop_event = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop_event.set)
+
+    await monitor_worker.start()
+    # Pipe writes block once the supervisor stops reading, so they run in a
+    # thread; a report still in flight means the next one is skipped
+    report: Optional[asyncio.Task] = None
+    try:
+        while not stop_event.is_set():
+            if report is not None and report.done() and report.exception() is not None:
+                logger.warning("Supervisor went away, stopping")
+                break
+            if report is None or report.done():
+                message = {"ready": monitor_worker.is_ready, "stats": monitor_worker.get_stats()}
+                report = asyncio.create_task(asyncio.to_thread(conn.send, message))
+            try:
+                await asyncio.wait_for(stop_event.wait(), settings.WORKER_STATS_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await monitor_worker.stop()
+        await close_connections()
+        if report is None or report.done():
+            conn.close()
+
+
+def _child_main(index: int, conn: Connection):
+    """Child process entry point: one MonitorWorker on its own event loop"""
+    # Ctrl-C reaches the whole process group; only the supervisor acts on it
+    # and stops the children with SIGTERM, so they aren't restarted mid-shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"%(asctime)s - worker-{index} - %(name)s - %(levelname)s - %(message)s",
+        # Spawning re-imports the parent's main module, which may have configured logging already
+        force=True,
+    )
+    run_event_loop(_run_child(conn))
+
+
+class _Child:
+    __slots__ = ("index", "process", "conn", "started_at", "restarts", "failures", "restart_at", "ready", "stats")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn: Optional[Connection] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.failures = 0  # crashes in a row, for restart backoff
+        self.restart_at: Optional[float] = None
+        self.ready = False
+        self.stats: Optional[dict] = None
+
+
+class WorkerSupervisor:
+    """Runs N MonitorWorker child processes and restarts any that exit.
+
+    Each child has its own event loop, probe client, Redis clients and
+    database pool, and joins the cluster as a separate member, so rendezvous
+    hashing splits the probe groups between children like between hosts.
+    Children write results through their own batched writers; only their
+    readiness and stats come back to the supervisor, over a one-way pipe.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self._context = multiprocessing.get_context("spawn")
+        self._children: List[_Child] = [_Child(index) for index in range(processes)]
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def is_ready(self) -> bool:
+        return all(child.ready and child.process is not None and child.process.is_alive() for child in self._children)
+
+    async def start(self):
+        for child in self._children:
+            self._spawn(child)
+        self._task = asyncio.create_task(self._watch_loop())
+        logger.info(f"Worker supervisor started {self.processes} processes")
+
+    def _spawn(self, child: _Child):
+        reader, writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_child_main, args=(child.index, writer), name=f"pulsecheck-worker-{child.index}", daemon=True
+        )
+        process.start()
+        # The child holds the only write end, so its exit shows up as EOF here
+        writer.close()
+
+        child.process = process
+        child.conn = reader
+        child.started_at = time.monotonic()
+        child.restart_at = None
+        child.ready = False
+        asyncio.get_running_loop().add_reader(reader.fileno(), self._receive, child)
+
+    def _receive(self, child: _Child):
+        try:
+            while child.conn.poll():
+                message = child.conn.recv()
+                child.ready = message["ready"]
+                child.stats = message["stats"]
+        except (EOFError, OSError):
+            self._close_conn(child)
+
+    def _close_conn(self, child: _Child):
+        if child.conn is not None:
+            asyncio.get_running_loop().remove_reader(child.conn.fileno())
+            child.conn.close()
+            child.conn = None
+        child.ready = False
+
+    async def _watch_loop(self):
+        while not self._stopping:
+            now = time.monotonic()
+            for child in self._children:
+                if child.process is not None and not child.process.is_alive():
+                    self._on_exit(child, now)
+                if child.restart_at is not None and now >= child.restart_at:
+                    logger.info(f"Restarting worker process {child.index}")
+                    child.restarts += 1
+                    self._spawn(child)
+            await asyncio.sleep(1)
+
+    def _on_exit(self, child: _Child, now: float):
+        """Plan the restart of a child that exited, backing off if it keeps crashing"""
+        exitcode = child.process.exitcode
+        self._close_conn(child)
+        child.process = None
+
+        # A child that ran for a while starts over with a short delay
+        if now - child.started_at > settings.WORKER_RESTART_MAX_DELAY:
+            child.failures = 0
+        delay = min(2 ** child.failures, settings.WORKER_RESTART_MAX_DELAY)
+        child.failures += 1
+        child.restart_at = now + delay
+        logger.error(f"Worker process {child.index} exited with code {exitcode}, restarting in {delay:.0f}s")
+
+    async def stop(self):
+        """Ask every child to stop, waiting up to WORKER_STOP_TIMEOUT before killing it"""
+        self._stopping = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        processes = [child.process for child in self._children if child.process is not None]
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            await asyncio.to_thread(process.join, settings.WORKER_STOP_TIMEOUT)
+            if process.is_alive():
+                logger.warning(f"Worker process {process.pid} did not stop in time, killing it")
+                process.kill()
+                await asyncio.to_thread(process.join)
+
+        for child in self._children:
+            self._close_conn(child)
+            child.process = None
+        logger.info("Worker supervisor stopped")
+
+    def get_stats(self) -> dict:
+        return {
+            "processes": self.processes,
+            "is_ready": self.is_ready,
+            "children": [
+                {
+                    "index": child.index,
+                    "pid": child.process.pid if child.process is not None else None,
+                    "alive": child.process is not None and child.process.is_alive(),
+                    "ready": child.ready,
+                    "restarts": child.restarts,
+                    "stats": child.stats,
+                }
+                for child in self._children
+            ],
+        }